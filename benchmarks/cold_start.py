@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Cold-start time of IconFactory().icon_names with the prebuilt codepoint index and with the metadata file parsers.
+
+Every measurement runs in a fresh interpreter, so nothing is cached between runs.
+
+    python benchmarks/cold_start.py [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# Emptying the loaded index makes _read_codepoints fall back to the metadata parsers, like a missing or stale index
+SCRIPT = """
+import time
+start = time.perf_counter()
+from iconipy import IconFactory
+if {fallback}:
+    IconFactory._codepoint_index = ({{}}, b"")
+imported = time.perf_counter()
+IconFactory(icon_set={icon_set!r}).icon_names
+done = time.perf_counter()
+print(imported - start, done - imported)
+"""
+
+
+def measure(icon_set, fallback, repeat):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC, os.environ.get("PYTHONPATH")])))
+    code = SCRIPT.format(icon_set=icon_set, fallback=fallback)
+    factory_times = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True).stdout
+        factory_times.append(float(output.split()[1]))
+    return statistics.median(factory_times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per icon set and mode, the median is reported")
+    args = parser.parse_args()
+
+    sys.path.insert(0, SRC)
+    from iconipy.iconipy import _ICON_SETS
+
+    print(f"{'icon set':34} {'metadata files':>15} {'codepoint index':>16}")
+    for icon_set in _ICON_SETS:
+        parsed = measure(icon_set, True, args.repeat)
+        indexed = measure(icon_set, False, args.repeat)
+        print(f"{icon_set:34} {parsed:12.1f} ms {indexed:13.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Time asRawList and asRawBuffer against the former getpixel loop of asRawList.
+
+The icon is rendered once and kept in the render cache, so the timings are mostly the pixel conversion.
+
+    python benchmarks/raw_pixels.py [--icon-size 256] [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from iconipy import IconFactory
+
+
+def getpixel_loop(factory, name, type):
+    """asRawList before it used tobytes()"""
+    icon = factory.asPil(name)
+    pixel_data = []
+    for i in range(0, icon.height):
+        for j in range(0, icon.width):
+            pixel = icon.getpixel((j, i))
+            for value in pixel:
+                pixel_data.append(value / 255.0 if type == "FLOAT" else value)
+    return pixel_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--icon-size", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=20, help="calls per method, the fastest is reported")
+    parser.add_argument("--name", default="house")
+    args = parser.parse_args()
+
+    factory = IconFactory(icon_set="lucide", icon_size=args.icon_size, font_color="black",
+                          background_color="white", cache_size=10_000_000)
+    factory.asPil(args.name)
+
+    for type in ("RGB", "FLOAT"):
+        expected = getpixel_loop(factory, args.name, type)
+        assert factory.asRawList(args.name, type) == expected
+        assert list(factory.asRawBuffer(args.name, type)) == list(array("f", expected) if type == "FLOAT" else expected)
+
+        print(f"{args.name} {args.icon_size}x{args.icon_size} type={type}")
+        for label, call, repeat in (
+            ("getpixel loop", lambda: getpixel_loop(factory, args.name, type), max(1, args.repeat // 10)),
+            ("asRawList", lambda: factory.asRawList(args.name, type), args.repeat),
+            ("asRawBuffer", lambda: factory.asRawBuffer(args.name, type), args.repeat),
+        ):
+            best = min(timeit.repeat(call, number=1, repeat=repeat))
+            print(f"  {label:14} {best * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
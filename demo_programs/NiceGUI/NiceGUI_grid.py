@@ -9,7 +9,7 @@ create_icon = IconFactory(icon_set='lucide', icon_size=(20), font_color='white')
 
 # Get icon names and shuffle them so we get a 
 # new set of icons each time we start the script
-icons = create_icon.icon_names.copy()
+icons = list(create_icon.icon_names)
 shuffle(icons)
 
 # Build the GUI
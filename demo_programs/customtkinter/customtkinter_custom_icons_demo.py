@@ -44,7 +44,7 @@ class App(customtkinter.CTk):
         )
 
         # Get icon names and shuffle them
-        icons = lightmode_icon.icon_names
+        icons = list(lightmode_icon.icon_names)
         shuffle(icons)
 
         # If you want to see all the icon names:
@@ -26,7 +26,7 @@ create_icon = IconFactory(icon_set = 'lucide',
                 )
 
 # Get icon names and shuffle them
-icons = create_icon.icon_names
+icons = list(create_icon.icon_names)
 shuffle(icons)
 
 # If you want to see all the icon names:
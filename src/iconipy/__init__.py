@@ -1,3 +1,3 @@
 #!/usr/bin/env python3
 
-from .iconipy import IconFactory, CustomIconFactory
\ No newline at end of file
+from .iconipy import IconFactory, CustomIconFactory, IconStyle, IconAtlas, fontCacheInfo, setFontCacheSize, clearFontCache, maskCacheInfo, setMaskCacheSize, clearMaskCache
\ No newline at end of file
@@ -74,9 +74,23 @@ import io
 import re
 import sys
 import json
+import math
+import array
 import uuid
-from PIL import Image, ImageTk, ImageQt, ImageDraw, ImageFont, ImageOps
-from tempfile import TemporaryDirectory
+import hashlib
+import weakref
+import bisect
+import heapq
+import itertools
+import queue
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, astuple, replace
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from PIL import Image, ImageDraw, ImageFont, ImageOps, ImageColor, ImageChops
+from tempfile import TemporaryDirectory, mkstemp
 from typing import Union, Tuple
 
 _ColorAttributeType = Union[Tuple, str]
@@ -86,6 +100,10 @@ _SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 _ASSET_PATH = os.path.join(_SCRIPT_DIR, "assets")
 _SCRIPT_VERSION = "0.3.2"
 
+# Prebuilt names and codepoints of all icon sets, see _build_codepoint_index
+_CODEPOINT_INDEX_FILE = os.path.join(_ASSET_PATH, "codepoints.idx")
+_CODEPOINT_INDEX_FORMAT = 1
+
 _lucide_cfg = {
     "FONT_FILE": os.path.join(_ASSET_PATH, "lucide", "lucide.ttf"),
     "METADATA_FILE": os.path.join(_ASSET_PATH, "lucide", "info.json"),
@@ -210,6 +228,1228 @@ _ICON_SETS = {
 }
 
 
+def _deletions(word):
+    """Returns word and all strings that are word with one character removed"""
+    return {word} | {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def _osa_distance(a, b):
+    """Optimal string alignment distance: Levenshtein distance that also counts swapped neighbouring characters as one edit"""
+    before_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before_previous[j - 2] + 1)
+        before_previous, previous = previous, current
+    return previous[-1]
+
+
+class _SearchIndex:
+    """Search index over the names of one icon set. Characters, bigrams and trigrams map to the positions of the names containing
+    them, the words of the names (split at "-", "_", ...) are indexed by their one-character deletions to find names
+    with a typo. Results are ranked: exact name, name prefix, word prefix, other substring, (tag, see _TagIndex,) typo."""
+
+    _WORD_SEPARATORS = re.compile(r"[^0-9a-z]+")
+
+    def __init__(self, names):
+        self.names = names
+        self.lower = tuple(name.lower() for name in names)
+        grams = {}
+        words = {}
+        initials = {}
+        for position, name in enumerate(self.lower):
+            for gram in {name[i:i + n] for n in (1, 2, 3) for i in range(len(name) - n + 1)}:
+                grams.setdefault(gram, []).append(position)
+            for word in set(self._WORD_SEPARATORS.split(name)):
+                if word:
+                    words.setdefault(word, []).append(position)
+                    initials.setdefault(word[0], set()).add(position)
+        self._grams = {gram: array.array("I", positions) for gram, positions in grams.items()}
+        self._words = words
+        # Names with a word starting with a character, ranks single character queries without a regex per name
+        self._initials = {character: frozenset(positions) for character, positions in initials.items()}
+        self._ranked = {}
+        self._deletions = {}
+        for word in words:
+            for variant in _deletions(word):
+                self._deletions.setdefault(variant, []).append(word)
+
+    def substring(self, query):
+        """Returns the sorted positions of the names containing query (lowercase)"""
+        if not query:
+            return list(range(len(self.lower)))
+        if len(query) <= 3:
+            return list(self._grams.get(query, ()))
+        postings = sorted((self._grams.get(query[i:i + 3], ()) for i in range(len(query) - 2)), key=len)
+        candidates = set(postings[0])
+        for positions in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(positions)
+        return [position for position in sorted(candidates) if query in self.lower[position]]
+
+    def typos(self, query):
+        """Returns the positions of the names with a word that is one typo (insertion, deletion, substitution or swap) away from query"""
+        words = set()
+        for variant in _deletions(query):
+            words.update(self._deletions.get(variant, ()))
+        positions = set()
+        for word in words:
+            if _osa_distance(query, word) <= 1:
+                positions.update(self._words[word])
+        return positions
+
+    def search(self, query, typos=False):
+        """Returns a list of (position, rank) for the names matching query (lowercase), lower ranks are better matches"""
+        if len(query) == 1 and not self._WORD_SEPARATORS.match(query):
+            initials = self._initials.get(query, frozenset())
+            word_start = lambda position, name: position in initials
+        else:
+            word_start_pattern = re.compile(r"(?<![0-9a-z])" + re.escape(query))
+            word_start = lambda position, name: word_start_pattern.search(name)
+        results = []
+        for position in self.substring(query):
+            name = self.lower[position]
+            if name == query:
+                rank = 0
+            elif name.startswith(query):
+                rank = 1
+            elif word_start(position, name):
+                rank = 2
+            else:
+                rank = 3
+            results.append((position, rank))
+        if typos and len(query) >= 3:
+            found = {position for position, _ in results}
+            results.extend((position, 5) for position in self.typos(query) - found)
+        return results
+
+    def sort_key(self, position):
+        """Order of names within a rank: shorter names first, then alphabetical"""
+        name = self.names[position]
+        return len(name), name
+
+    def ranked(self, query, typos=False):
+        """Returns the positions of the names matching query (lowercase) ordered by rank and sort_key, and a tuple
+        with the start of each rank 0-5 in the positions followed by their end. Single characters match a large part of
+        the names, their results are cached."""
+        result = self._ranked.get(query) if len(query) == 1 else None
+        if result is None:
+            by_rank = [[] for _ in range(6)]
+            for position, rank in self.search(query, typos):
+                by_rank[rank].append(position)
+            positions = array.array("I")
+            bounds = [0]
+            for group in by_rank:
+                group.sort(key=self.sort_key)
+                positions.extend(group)
+                bounds.append(len(positions))
+            result = positions, tuple(bounds)
+            if len(query) == 1:
+                self._ranked[query] = result
+        return result
+
+
+# Words with a similar meaning in icon names, search(tags=True) finds e.g. the "delete" icons when searching for "trash".
+# Only the query is expanded, so a word with several meanings (off, start, line, ...) must not be part of a group
+_SYNONYMS = (
+    ("delete", "trash", "bin", "garbage", "erase"),
+    ("home", "house"),
+    ("settings", "gear", "cog", "preferences", "options", "configuration"),
+    ("search", "find", "magnifier", "lookup"),
+    ("edit", "pencil", "pen", "write", "modify"),
+    ("add", "plus", "new", "create"),
+    ("close", "cancel", "dismiss"),
+    ("user", "person", "account", "profile"),
+    ("users", "people", "group", "team"),
+    ("mail", "email", "envelope", "inbox"),
+    ("save", "disk", "floppy"),
+    ("refresh", "reload", "sync", "update"),
+    ("lock", "locked", "padlock", "secure"),
+    ("unlock", "unlocked"),
+    ("warning", "alert", "caution", "danger"),
+    ("info", "information", "about"),
+    ("help", "question", "support"),
+    ("calendar", "date", "event", "schedule"),
+    ("clock", "time", "watch", "alarm", "timer"),
+    ("image", "photo", "picture", "img"),
+    ("video", "movie", "film"),
+    ("music", "audio", "song"),
+    ("volume", "sound", "speaker"),
+    ("mute", "silent"),
+    ("mic", "microphone", "voice"),
+    ("phone", "call", "telephone"),
+    ("chat", "message", "comment", "conversation"),
+    ("cart", "basket", "shopping", "shop"),
+    ("money", "cash", "payment", "dollar", "currency", "coin"),
+    ("star", "favorite", "rating"),
+    ("heart", "love", "like"),
+    ("bookmark", "favorite", "saved"),
+    ("share", "send", "forward"),
+    ("link", "chain", "url", "hyperlink"),
+    ("attach", "attachment", "paperclip", "clip"),
+    ("copy", "duplicate", "clone"),
+    ("paste", "clipboard"),
+    ("cut", "scissors"),
+    ("print", "printer"),
+    ("file", "document", "doc", "page"),
+    ("folder", "directory"),
+    ("menu", "hamburger", "bars"),
+    ("more", "ellipsis", "dots", "overflow"),
+    ("exit", "logout", "signout", "leave", "quit"),
+    ("login", "signin", "enter"),
+    ("notification", "notifications", "bell"),
+    ("location", "map", "pin", "place", "marker", "gps"),
+    ("visibility", "visible", "eye", "show", "view"),
+    ("hide", "hidden", "invisible"),
+    ("check", "done", "ok", "tick", "confirm", "success"),
+    ("stop", "halt"),
+    ("pause", "hold"),
+    ("power", "shutdown"),
+    ("wifi", "wireless", "network", "signal"),
+    ("battery", "charge", "charging"),
+    ("sun", "day", "brightness"),
+    ("moon", "dark", "night"),
+    ("globe", "world", "earth", "language", "web", "internet"),
+    ("filter", "funnel"),
+    ("chart", "graph", "analytics", "statistics", "stats"),
+    ("code", "developer", "programming"),
+    ("terminal", "console", "shell", "command"),
+    ("book", "read", "library"),
+    ("key", "password", "access"),
+    ("shield", "security", "protect", "protection"),
+    ("tag", "label", "price"),
+    ("gift", "present"),
+    ("fullscreen", "maximize", "expand"),
+    ("minimize", "shrink", "collapse"),
+    ("solid", "filled", "fill"),
+    ("outline", "outlined"),
+)
+
+# Name prefixes that encode a style or category of the icon set instead of a meaning
+_NAME_PREFIX_TAGS = {
+    "bx": ("regular",),
+    "bxs": ("solid",),
+    "bxl": ("logo", "brand"),
+    "lni": (),
+}
+
+
+class _TagIndex:
+    """Inverted index of the tags of the names of one icon set. The tags of a name are its words, the category encoded
+    in its prefix (bx-, bxs-, bxl-, lni-) and the tags and categories from the icon set's metadata. A query word that
+    is in _SYNONYMS also matches the other words of its group. Tags are kept in a sorted tuple with a parallel tuple
+    of name positions, prefix queries use bisect."""
+
+    def __init__(self, names, metadata_tags):
+        self._synonyms = {}
+        for group in _SYNONYMS:
+            for word in group:
+                self._synonyms.setdefault(word, set()).update(group)
+        index = {}
+        for position, name in enumerate(names):
+            words = self._words(name)
+            tags = set()
+            if words and words[0] in _NAME_PREFIX_TAGS:
+                tags.update(_NAME_PREFIX_TAGS[words.pop(0)])
+            tags.update(words)
+            for tag in metadata_tags.get(name, ()):
+                tags.update(self._words(tag))
+            for tag in tags:
+                index.setdefault(tag, []).append(position)
+        self.tags = tuple(sorted(index))
+        self._positions = tuple(array.array("I", index[tag]) for tag in self.tags)
+
+    @staticmethod
+    def _words(text):
+        return [word for word in _SearchIndex._WORD_SEPARATORS.split(text.lower()) if word]
+
+    def _match(self, word):
+        """Positions of the names with the tag word or, if word has three or more characters, a tag starting with word"""
+        positions = set()
+        index = bisect.bisect_left(self.tags, word)
+        while index < len(self.tags) and self.tags[index].startswith(word):
+            if len(word) >= 3 or self.tags[index] == word:
+                positions.update(self._positions[index])
+            index += 1
+        return positions
+
+    def _exact(self, word):
+        """Positions of the names with the tag word"""
+        index = bisect.bisect_left(self.tags, word)
+        if index < len(self.tags) and self.tags[index] == word:
+            return set(self._positions[index])
+        return set()
+
+    def search(self, query):
+        """Returns the positions of the names matching all words of query, a word matches its synonyms as well"""
+        positions = None
+        for word in self._words(query):
+            matches = self._match(word)
+            for synonym in self._synonyms.get(word, ()):
+                matches |= self._exact(synonym)
+            positions = matches if positions is None else positions & matches
+            if not positions:
+                return set()
+        return positions or set()
+
+
+class _CodepointTable(Mapping):
+    """Read-only mapping of icon names to integer codepoints. Names are kept in a sorted tuple
+    and codepoints in a parallel array, one table per icon set is shared by all factories."""
+
+    def __init__(self, names, codepoints):
+        # names must be sorted and unique
+        self.names = tuple(names)
+        self._codepoints = array.array("I", codepoints)
+        self._search_index = None
+        self._tag_index = None
+
+    @classmethod
+    def from_dict(cls, codepoints: dict):
+        names = sorted(codepoints.keys())
+        return cls(names, (codepoints[name] for name in names))
+
+    def _index(self, name):
+        index = bisect.bisect_left(self.names, name)
+        if index < len(self.names) and self.names[index] == name:
+            return index
+        return -1
+
+    def __getitem__(self, name):
+        index = self._index(name) if isinstance(name, str) else -1
+        if index < 0:
+            raise KeyError(name)
+        return self._codepoints[index]
+
+    def __contains__(self, name):
+        return isinstance(name, str) and self._index(name) >= 0
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def search_index(self):
+        """Returns the _SearchIndex of the names, built on the first call"""
+        if self._search_index is None:
+            # Concurrent first calls may build it twice, both results are equal
+            self._search_index = _SearchIndex(self.names)
+        return self._search_index
+
+    def tag_index(self, read_tags):
+        """Returns the _TagIndex of the names, built on the first call with the metadata tags returned by read_tags()"""
+        if self._tag_index is None:
+            self._tag_index = _TagIndex(self.names, read_tags())
+        return self._tag_index
+
+
+class _LRUCache:
+    """A small thread-safe least-recently-used cache with hit/miss counters. Bounded by an entry count
+    and optionally by memory usage, where sizeof(value) returns the number of bytes of a value."""
+
+    def __init__(self, maxsize: int, max_bytes: int = None, sizeof=None):
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._items[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store value under key unless another thread got there first. Returns the cached value."""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+            size = self._sizeof(value) if self._sizeof else 0
+            if self.max_bytes is not None and size > self.max_bytes:
+                return value
+            self._items[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            self._evict()
+            return value
+
+    def _evict(self):
+        while self._items and (len(self._items) > max(self.maxsize, 0)
+                               or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            key, _ = self._items.popitem(last=False)
+            self._bytes -= self._sizes.pop(key)
+
+    def resize(self, maxsize: int = None, max_bytes: int = None):
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict:
+        with self._lock:
+            info = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._items),
+                "maxsize": self.maxsize,
+            }
+            if self.max_bytes is not None:
+                info["bytes"] = self._bytes
+                info["max_bytes"] = self.max_bytes
+            return info
+
+
+def _image_bytes(value) -> int:
+    """Memory used by the pixels of an image or of the images in a (nested) tuple"""
+    if isinstance(value, Image.Image):
+        return value.width * value.height * len(value.getbands())
+    if isinstance(value, tuple):
+        return sum(_image_bytes(item) for item in value)
+    return 0
+
+
+_MASK_CACHE_BYTES = 32_000_000
+
+_font_cache = _LRUCache(maxsize=32)
+
+# Background plates (rounded rectangles) by size, colors, outline width, radius and quality
+_plate_cache = _LRUCache(maxsize=64, max_bytes=_MASK_CACHE_BYTES, sizeof=_image_bytes)
+
+# Coverage masks of background and outline by size, radius and outline width
+_background_mask_cache = _LRUCache(maxsize=64, max_bytes=_MASK_CACHE_BYTES, sizeof=_image_bytes)
+
+# Glyph coverage masks by font, font size, variation, codepoint and icon size
+_mask_cache = _LRUCache(maxsize=1024, max_bytes=_MASK_CACHE_BYTES, sizeof=_image_bytes)
+
+
+_BACKGROUND_QUALITIES = ("analytic", "reference")
+
+# Byte value -> channel value 0-1 for the "FLOAT" pixel data
+_FLOAT_VALUES = tuple(value / 255.0 for value in range(256))
+
+
+def _rgba(color):
+    """Resolve a color name, hex string or RGB(A) tuple to an RGBA tuple, None stays None"""
+    if color is None:
+        return None
+    if isinstance(color, str):
+        return ImageColor.getcolor(color, "RGBA")
+    color = tuple(color)
+    return color if len(color) == 4 else color + (255,)
+
+
+def _corner_pixel_coverage(a, b, c, d, radius):
+    """Returns the area of the pixel [a, b] x [c, d] that is covered by a rounded corner. The coordinates
+    are measured outwards from the center of the corner's circle, everything with u <= 0 or v <= 0 is inside."""
+    breaks = [a, b]
+    for v in (c, d):
+        if 0 <= v <= radius:
+            breaks.append(math.sqrt(radius * radius - v * v))
+    breaks.extend((0.0, radius))
+    breaks = sorted(u for u in set(breaks) if a <= u <= b)
+
+    def integral(u):
+        # Antiderivative of sqrt(radius² - u²)
+        return (u * math.sqrt(max(radius * radius - u * u, 0.0)) + radius * radius * math.asin(min(u / radius, 1.0))) / 2
+
+    area = 0.0
+    for u0, u1 in zip(breaks, breaks[1:]):
+        middle = (u0 + u1) / 2
+        if middle <= 0:
+            height = d - c
+        elif middle >= radius:
+            height = min(max(0.0, c), d) - c
+        else:
+            g = math.sqrt(radius * radius - middle * middle)
+            if g >= d:
+                height = d - c
+            elif g <= c:
+                height = 0.0
+            else:
+                # The arc crosses the pixel on the whole sub-interval
+                area += integral(u1) - integral(u0) - c * (u1 - u0)
+                continue
+        area += height * (u1 - u0)
+    return area
+
+
+def _corner_tile(radius):
+    """Returns an "L" image with the exact coverage of the top left corner of a rounded rectangle"""
+    size = math.ceil(radius)
+    rows = []
+    for j in range(size):
+        c = radius - j - 1
+        d = radius - j
+        # Pixels left of the arc are empty, pixels right of it are fully covered
+        arc_top = math.sqrt(radius * radius - max(c, 0.0) ** 2)
+        arc_bottom = math.sqrt(max(radius * radius - d * d, 0.0))
+        empty = min(max(math.floor(radius - 1 - arc_top) + 1, 0), size)
+        full = min(max(math.ceil(radius - arc_bottom), empty), size)
+        row = bytearray(size)
+        for i in range(empty, full):
+            coverage = _corner_pixel_coverage(radius - i - 1, radius - i, c, d, radius)
+            row[i] = min(max(round(coverage * 255), 0), 255)
+        row[full:] = b"\xff" * (size - full)
+        rows.append(bytes(row))
+    return Image.frombytes("L", (size, size), b"".join(rows))
+
+
+def _rounded_rectangle_mask(width, height, radius):
+    """Returns an "L" image with the per pixel coverage of a rounded rectangle filling width x height"""
+    mask = Image.new("L", (width, height), 255)
+    radius = min(radius, width / 2, height / 2)
+    if radius <= 0:
+        return mask
+    tile = _corner_tile(radius)
+    size = tile.width
+    mask.paste(tile, (0, 0))
+    mask.paste(tile.transpose(Image.Transpose.FLIP_LEFT_RIGHT), (width - size, 0))
+    mask.paste(tile.transpose(Image.Transpose.FLIP_TOP_BOTTOM), (0, height - size))
+    mask.paste(tile.transpose(Image.Transpose.ROTATE_180), (width - size, height - size))
+    return mask
+
+
+def _colored_layer(color, mask):
+    """Returns an RGBA image in color with the color's alpha scaled by mask"""
+    layer = Image.new("RGBA", mask.size, color)
+    alpha = color[3]
+    layer.putalpha(mask.point(lambda value: (value * alpha + 127) // 255))
+    return layer
+
+
+def _get_font(font_path: str, font_size: int, variation=None):
+    """Return a (shared) FreeType font object for font_path and font_size. variation can be the
+    name of a named instance (str) or a tuple of axis values of a variable font."""
+    key = (font_path, font_size, variation)
+    font = _font_cache.get(key)
+    if font is None:
+        # Parse the font outside the lock, concurrent misses for the same key are harmless
+        font = ImageFont.truetype(font_path, font_size)
+        if isinstance(variation, str):
+            font.set_variation_by_name(variation)
+        elif variation is not None:
+            font.set_variation_by_axes(list(variation))
+        font = _font_cache.put(key, font)
+    return font
+
+
+def fontCacheInfo() -> dict:
+    """Returns the statistics of the process-wide font cache shared by all IconFactories as a dictionary
+    with the keys "hits", "misses", "size" (fonts currently cached) and "maxsize"."""
+    return _font_cache.info()
+
+
+def setFontCacheSize(maxsize: int):
+    """Set the maximum number of font objects (font file, font size and variation) kept in the
+    process-wide font cache. Least recently used fonts are evicted first. Default is 32, 0 disables caching."""
+    _font_cache.resize(maxsize)
+
+
+def clearFontCache():
+    """Remove all font objects from the process-wide font cache and reset its counters."""
+    _font_cache.clear()
+
+
+def maskCacheInfo() -> dict:
+    """Returns the statistics of the process-wide caches for glyph masks, background masks and background plates
+    shared by all IconFactories as a dictionary with the keys "glyphs", "backgrounds" and "plates". Each value is a
+    dictionary with the keys "hits", "misses", "size", "maxsize", "bytes" (pixel memory in use) and "max_bytes"."""
+    return {
+        "glyphs": _mask_cache.info(),
+        "backgrounds": _background_mask_cache.info(),
+        "plates": _plate_cache.info(),
+    }
+
+
+def setMaskCacheSize(max_bytes: int):
+    """Set the maximum pixel memory in bytes used by each of the process-wide caches for glyph masks, background masks
+    and background plates. Least recently used entries are evicted first. Default is 32 MB per cache, 0 disables caching."""
+    for cache in (_mask_cache, _background_mask_cache, _plate_cache):
+        cache.resize(max_bytes=max_bytes)
+
+
+def clearMaskCache():
+    """Remove all glyph masks, background masks and background plates from the process-wide caches and reset their counters."""
+    for cache in (_mask_cache, _background_mask_cache, _plate_cache):
+        cache.clear()
+
+
+class _RenderCache:
+    """Thread-safe cache for rendered icons that is bounded by memory usage instead of an entry count.
+    Recently used icons are kept as PIL images. Icons evicted from this tier are kept as PNG bytes
+    as long as the compressed budget allows it and are decoded again on the next hit."""
+
+    def __init__(self, max_bytes: int, compressed_max_bytes: int = 0):
+        self._lock = threading.Lock()
+        self._images = OrderedDict()
+        self._compressed = OrderedDict()
+        self._image_bytes = 0
+        self._compressed_bytes = 0
+        self.max_bytes = max_bytes
+        self.compressed_max_bytes = compressed_max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _sizeof(image):
+        return image.width * image.height * len(image.getbands())
+
+    def get(self, key):
+        """Returns a copy of the cached image or None"""
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return image.copy()
+            data = self._compressed.pop(key, None)
+            if data is None:
+                self.misses += 1
+                return None
+            self._compressed_bytes -= len(data)
+            self.hits += 1
+        image = Image.open(io.BytesIO(data))
+        image.load()
+        self.put(key, image)
+        return image.copy()
+
+    def put(self, key, image):
+        """Store image under key, the cache takes ownership of the image object"""
+        size = self._sizeof(image)
+        if size > self.max_bytes:
+            return
+        evicted = []
+        with self._lock:
+            if key in self._images:
+                return
+            self._images[key] = image
+            self._image_bytes += size
+            while self._image_bytes > self.max_bytes:
+                evicted_key, evicted_image = self._images.popitem(last=False)
+                self._image_bytes -= self._sizeof(evicted_image)
+                evicted.append((evicted_key, evicted_image))
+        if self.compressed_max_bytes <= 0:
+            return
+        # Compress outside the lock, PNG encoding is lossless
+        for evicted_key, evicted_image in evicted:
+            with io.BytesIO() as output:
+                evicted_image.save(output, format="PNG")
+                data = output.getvalue()
+            if len(data) > self.compressed_max_bytes:
+                continue
+            with self._lock:
+                if evicted_key in self._images or evicted_key in self._compressed:
+                    continue
+                self._compressed[evicted_key] = data
+                self._compressed_bytes += len(data)
+                while self._compressed_bytes > self.compressed_max_bytes:
+                    _, dropped = self._compressed.popitem(last=False)
+                    self._compressed_bytes -= len(dropped)
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+            self._compressed.clear()
+            self._image_bytes = 0
+            self._compressed_bytes = 0
+
+    def info(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "images": len(self._images),
+                "image_bytes": self._image_bytes,
+                "max_bytes": self.max_bytes,
+                "compressed": len(self._compressed),
+                "compressed_bytes": self._compressed_bytes,
+                "compressed_max_bytes": self.compressed_max_bytes,
+            }
+
+
+# Font file path, size and modification time -> SHA-256 of the font file
+_font_digests = {}
+
+
+def _font_digest(font_path):
+    """Returns the SHA-256 hex digest of the font file, computed once per process and font version"""
+    stat = os.stat(font_path)
+    key = (font_path, stat.st_size, stat.st_mtime_ns)
+    digest = _font_digests.get(key)
+    if digest is None:
+        with open(font_path, "rb") as file_handle:
+            digest = hashlib.sha256(file_handle.read()).hexdigest()
+        _font_digests[key] = digest
+    return digest
+
+
+class _DiskCache:
+    """Directory of encoded icons that can be shared by threads and processes. Entries are named after a hash of
+    everything that affects the encoded data and are written atomically (temporary file + os.replace).
+    Every entry starts with a header holding a checksum of the data, damaged entries are deleted and count as missing.
+    When the entries grow beyond max_bytes the least recently used ones (by modification time) are removed."""
+
+    _MAGIC = b"ICONIPY1"
+    _HEADER_SIZE = len(_MAGIC) + hashlib.sha256().digest_size
+    _SUFFIX = ".icon"
+    _TEMP_PREFIX = ".tmp-"
+
+    def __init__(self, directory: str, max_bytes: int = 0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None  # Bytes in the directory, scanned before the first write
+        self.hits = 0
+        self.misses = 0
+        self.corrupt = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self._SUFFIX)
+
+    def get(self, key):
+        """Returns the data stored under key or None"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file_handle:
+                blob = file_handle.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        data = blob[self._HEADER_SIZE:]
+        if blob[:self._HEADER_SIZE] != self._MAGIC + hashlib.sha256(data).digest():
+            with self._lock:
+                self.corrupt += 1
+                self.misses += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        try:
+            os.utime(path)  # Marks the entry as recently used
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """Store data under key. The cache is best effort, write errors are ignored"""
+        blob = self._MAGIC + hashlib.sha256(data).digest() + data
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            file_descriptor, temp_path = mkstemp(prefix=self._TEMP_PREFIX, dir=self.directory)
+            try:
+                with os.fdopen(file_descriptor, "wb") as file_handle:
+                    file_handle.write(blob)
+                os.replace(temp_path, self._path(key))
+            except BaseException:
+                os.remove(temp_path)
+                raise
+        except OSError:
+            return
+        if not self.max_bytes or self.max_bytes <= 0:
+            return
+        with self._lock:
+            if self._size is None:
+                self._evict()
+            else:
+                self._size += len(blob)
+                if self._size > self.max_bytes:
+                    self._evict()
+
+    def _evict(self):
+        """Rescan the directory and delete the oldest entries until it is below 90% of max_bytes"""
+        entries = []
+        total = 0
+        now = time.time()
+        try:
+            with os.scandir(self.directory) as directory:
+                for entry in directory:
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    if entry.name.startswith(self._TEMP_PREFIX):
+                        # Left behind by a process that died while writing
+                        if now - stat.st_mtime > 3600:
+                            self._remove(entry.path)
+                    elif entry.name.endswith(self._SUFFIX):
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total += stat.st_size
+        except OSError:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes * 0.9:
+                break
+            self._remove(path)
+            total -= size
+        self._size = total
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # Already removed by another process
+
+    def info(self) -> dict:
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "hits": self.hits,
+                "misses": self.misses,
+                "corrupt": self.corrupt,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def _background_masks(width, height, radius, outline_width):
+    """Returns the coverage masks of the background fill and of the outline ring (None without outline).
+    The masks only depend on the geometry and are shared by all background and outline colors."""
+    key = (width, height, radius, outline_width)
+    masks = _background_mask_cache.get(key)
+    if masks is None:
+        outer = _rounded_rectangle_mask(width, height, radius)
+        ring = None
+        if outline_width > 0:
+            inner = Image.new("L", (width, height), 0)
+            inner_width = width - 2 * outline_width
+            inner_height = height - 2 * outline_width
+            if inner_width > 0 and inner_height > 0:
+                inner.paste(
+                    _rounded_rectangle_mask(inner_width, inner_height, max(radius - outline_width, 0)),
+                    (outline_width, outline_width),
+                )
+            ring = ImageChops.subtract(outer, inner)
+        masks = _background_mask_cache.put(key, (outer, ring))
+    return masks
+
+
+def _image_round_background(
+    size = (64,64),
+    fill = "silver",
+    outline = "grey",
+    outline_width = 7,
+    outline_radius = 10,
+    factor = 3,
+    quality = "analytic",
+):
+    """Create and return a background image with rounded corners. Set the outline radius to size/2 to achieve a circular background.
+    quality="analytic" computes the exact coverage of every pixel at target resolution, quality="reference" draws at "factor" times
+    the size and downsamples the result."""
+    width = size[0] 
+    height = size[1]
+    if quality == "reference":
+        im = Image.new("RGBA", (factor * width, factor * height), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(im, "RGBA")
+        draw.rounded_rectangle(
+            (0, 0, (factor * width)-1, (factor * height)-1),
+            radius=factor * outline_radius,
+            outline=outline,
+            fill=fill,
+            width=factor * outline_width,
+        )
+        im = im.resize((width, height), Image.LANCZOS)
+        return im
+
+    # Like ImageDraw.rounded_rectangle the fill only covers the inside of the outline. The fill is drawn through
+    # outer - ring and both layers are added with premultiplied alpha, so the coverage of the shape's edge is
+    # applied once and partially covered pixels keep their colors.
+    outline_radius = min(outline_radius, width / 2, height / 2)
+    fill = _rgba(fill)
+    outline = _rgba(outline) if outline_width > 0 else None
+    outer, ring = _background_masks(width, height, outline_radius, outline_width if outline else 0)
+    if not outline:
+        if fill:
+            return _colored_layer(fill, outer)
+        return Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    outline_layer = _colored_layer(outline, ring)
+    if not fill:
+        return outline_layer
+    fill_layer = _colored_layer(fill, ImageChops.subtract(outer, ring))
+    return ImageChops.add(fill_layer.convert("RGBa"), outline_layer.convert("RGBa")).convert("RGBA")
+
+
+def _glyph_mask(character, font_path, style):
+    """Returns the coverage mask (mode "L") of character cropped to the glyph and the position of the mask on an icon
+    of the style's size. Both are None if the glyph is empty. The mask does not depend on any color, so all color
+    variants of an icon share it."""
+    key = (font_path, style.font_size, None, ord(character), style.icon_size)
+    entry = _mask_cache.get(key)
+    if entry is None:
+        width, height = style.icon_size
+        mask = Image.new("L", style.icon_size, 0)
+        font = _get_font(font_path, style.font_size)
+        ImageDraw.Draw(mask).text((width // 2, height // 2), character, font=font, anchor="mm", fill=255)
+        box = mask.getbbox()
+        entry = _mask_cache.put(key, (mask.crop(box), box[:2]) if box else (None, None))
+    return entry
+
+
+def _draw_character(character, font_path, style):
+    """Render character with the font at font_path in the given IconStyle"""
+    width, height = style.icon_size
+
+    # Add a background, the plate is identical for all icons sharing the same style
+    if style.background_color or style.outline_width:
+        plate_key = (
+            style.icon_size,
+            style.background_color,
+            style.outline_color,
+            style.outline_width,
+            style.background_radius,
+            style.background_quality,
+        )
+        plate = _plate_cache.get(plate_key)
+        if plate is None:
+            plate = _plate_cache.put(plate_key, _image_round_background(
+                size = style.icon_size,
+                fill = style.background_color,
+                outline = style.outline_color,
+                outline_width = style.outline_width,
+                outline_radius = style.background_radius,
+                quality = style.background_quality,
+            ))
+        image = plate.copy()
+    else:
+        image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+
+    if style.font_size > 0:
+        # Fill the font color through the glyph's coverage mask, this blends exactly like ImageDraw.text
+        mask, position = _glyph_mask(character, font_path, style)
+        if mask is not None:
+            font_color = style.font_color if style.font_color is not None else (255, 255, 255, 255)
+            image.paste(font_color, position, mask)
+    return image
+
+
+# Ways to derive a "disabled" image from a rendered icon, see IconFactory.asPilStates
+_DISABLED_MODES = ("desaturate", "fade")
+
+
+def _disabled_image(image, mode):
+    """Returns a disabled looking copy of an RGBA image. "desaturate" converts the colors to grey and keeps the
+    transparency, "fade" keeps the colors and reduces the opacity to 38% (like Material Design's disabled state)"""
+    if mode == "desaturate":
+        return image.convert("LA").convert("RGBA")
+    faded = image.copy()
+    faded.putalpha(image.getchannel("A").point(lambda value: value * 38 // 100))
+    return faded
+
+
+def _encode_image(image, image_format, **options):
+    with io.BytesIO() as output:
+        image.save(output, format=image_format, **options)
+        return output.getvalue()
+
+
+def _save_options(save_as, style):
+    """Encoder options for saving an icon to file save_as"""
+    if save_as.lower().endswith('.ico'):
+        return {'sizes': [style.icon_size]}
+    return {}
+
+
+def _save_image(image, save_as, style):
+    image.save(save_as, **_save_options(save_as, style))
+
+
+def _save_icons(font_path, style, icons, save_to_dir, extension):
+    """Render and save a chunk of (name, codepoint) pairs, runs in a worker process of saveAll.
+    Returns a list of (name, error message) for the icons that could not be saved."""
+    failed = []
+    for name, codepoint in icons:
+        try:
+            image = _draw_character(chr(codepoint), font_path, style)
+            _save_image(image, os.path.join(save_to_dir, f"{name}.{extension}"), style)
+        except Exception as error:
+            failed.append((name, f"{type(error).__name__}: {error}"))
+    return failed
+
+
+# Pixel formats of asPixelBuffer: name -> (premultiplied alpha, order of the bytes in memory).
+# ARGB32 is one native-endian 32 bit integer 0xAARRGGBB per pixel like Qt's QImage.Format_ARGB32 and Cairo's FORMAT_ARGB32
+_NATIVE_ARGB32 = "BGRA" if sys.byteorder == "little" else "ARGB"
+_PIXEL_FORMATS = {
+    "RGBA": (False, "RGBA"),
+    "BGRA": (False, "BGRA"),
+    "ARGB": (False, "ARGB"),
+    "RGBA_Premultiplied": (True, "RGBA"),
+    "BGRA_Premultiplied": (True, "BGRA"),
+    "ARGB_Premultiplied": (True, "ARGB"),
+    "ARGB32": (False, _NATIVE_ARGB32),
+    "ARGB32_Premultiplied": (True, _NATIVE_ARGB32),
+}
+
+
+def _pixel_bytes(image, pixel_format):
+    """Pack the pixels of an RGBA image in one of the _PIXEL_FORMATS"""
+    try:
+        premultiplied, order = _PIXEL_FORMATS[pixel_format]
+    except KeyError:
+        raise ValueError(f'Unsupported pixel format "{pixel_format}", use one of {", ".join(_PIXEL_FORMATS)}') from None
+    if premultiplied:
+        image = image.convert("RGBa")
+    if order == "ARGB":
+        # Pillow has no packer with alpha first, reorder the bands instead
+        red, green, blue, alpha = image.split()
+        return Image.merge("RGBA", (alpha, red, green, blue)).tobytes()
+    return image.tobytes("raw", order.replace("A", "a") if premultiplied else order)
+
+
+def _import_numpy():
+    """Import NumPy on demand, it is only needed by the NumPy bridges"""
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('NumPy is not installed, install it with "pip install numpy" to use asNumpy') from None
+    return numpy
+
+
+def _numpy_pixels(numpy, image):
+    """Read-only (height, width, 4) uint8 array backed by the RGBA bytes of image"""
+    return numpy.frombuffer(image.tobytes(), dtype=numpy.uint8).reshape(image.height, image.width, 4)
+
+
+# Shared by the async methods: bounded thread pool and renders that are still running, keyed by request
+_ASYNC_WORKERS = 4
+_async_executor = None
+_async_lock = threading.Lock()
+_async_inflight = {}
+
+
+def _submit_coalesced(key, function):
+    """Run function on the thread pool of the async methods unless a request with the same key is still running.
+    Returns the concurrent.futures.Future that all callers with this key wait for."""
+    global _async_executor
+    with _async_lock:
+        future = _async_inflight.get(key)
+        if future is not None:
+            return future
+        if _async_executor is None:
+            _async_executor = ThreadPoolExecutor(max_workers=_ASYNC_WORKERS, thread_name_prefix="iconipy")
+        future = _async_executor.submit(function)
+        _async_inflight[key] = future
+
+    def forget(done):
+        with _async_lock:
+            if _async_inflight.get(key) is done:
+                del _async_inflight[key]
+
+    future.add_done_callback(forget)
+    return future
+
+
+def _skyline_pack(items, width, height, padding):
+    """Bottom-left skyline bin packing of (key, width, height) items into one width x height sheet.
+    Returns a dictionary {key: (x, y)} of the placed items and a list of the items that did not fit."""
+    skyline = [(0, 0, width)]  # Segments (x, y, width) from left to right
+    placed = {}
+    rest = []
+    for key, item_width, item_height in items:
+        item_width += padding
+        item_height += padding
+        best = None
+        for i, (x, _, _) in enumerate(skyline):
+            if x + item_width > width:
+                break
+            # The item rests on the highest segment below it
+            y = 0
+            covered = 0
+            j = i
+            while covered < item_width:
+                y = max(y, skyline[j][1])
+                covered += skyline[j][2]
+                j += 1
+            if y + item_height <= height and (best is None or (y + item_height, x) < best[0]):
+                best = ((y + item_height, x), i, x, y)
+        if best is None:
+            rest.append((key, item_width - padding, item_height - padding))
+            continue
+        _, i, x, y = best
+        placed[key] = (x, y)
+        # Replace the covered part of the skyline with the top edge of the item
+        new_segments = [(x, y + item_height, item_width)]
+        end = x + item_width
+        j = i
+        while j < len(skyline) and skyline[j][0] < end:
+            segment_x, segment_y, segment_width = skyline[j]
+            if segment_x + segment_width > end:
+                new_segments.append((end, segment_y, segment_x + segment_width - end))
+            j += 1
+        skyline[i:j] = new_segments
+        # Merge neighbours at the same height
+        merged = [skyline[0]]
+        for segment in skyline[1:]:
+            if segment[1] == merged[-1][1]:
+                merged[-1] = (merged[-1][0], merged[-1][1], merged[-1][2] + segment[2])
+            else:
+                merged.append(segment)
+        skyline = merged
+    return placed, rest
+
+
+def _pack_sheets(items, max_size, padding):
+    """Distribute (key, width, height) items on as few power-of-two sheets as possible.
+    Returns a list of (sheet width, sheet height, {key: (x, y)})."""
+    if max_size < 1:
+        raise ValueError(f'max_size must be at least 1, got {max_size}')
+    # The largest power of two that is not larger than max_size
+    sheet_size = 1 << (max_size.bit_length() - 1)
+    remaining = sorted(items, key=lambda item: (-item[2], -item[1]))
+    sheets = []
+    while remaining:
+        largest = max(max(item_width, item_height) for _, item_width, item_height in remaining) + padding
+        if largest > sheet_size:
+            raise ValueError(f'Icons do not fit on a sheet of {sheet_size}x{sheet_size} pixels (max_size {max_size})')
+        area = sum((item_width + padding) * (item_height + padding) for _, item_width, item_height in remaining)
+        width = height = 1 << max(largest - 1, math.isqrt(area - 1) if area > 1 else 0).bit_length()
+        width = height = min(width, sheet_size)
+        while True:
+            placed, rest = _skyline_pack(remaining, width, height, padding)
+            if not rest or (width >= sheet_size and height >= sheet_size):
+                break
+            if width <= height:
+                width = min(width * 2, sheet_size)
+            else:
+                height = min(height * 2, sheet_size)
+        sheets.append((width, height, placed))
+        remaining = rest
+    return sheets
+
+
+class IconAtlas:
+    """Icons packed into one or more sprite sheets (texture atlas). Created by IconFactory.asAtlas().
+
+        sheets (list): The sheets as PIL Image Objects, the sizes are powers of two
+        coordinates (dict): Maps each icon name to (sheet index, x, y, width, height)
+    """
+
+    def __init__(self, sheets: list, coordinates: dict) -> None:
+        self.sheets = sheets
+        '''The sheets as PIL Image Objects'''
+
+        self.coordinates = coordinates
+        '''Maps each icon name to (sheet index, x, y, width, height)'''
+
+    def asJson(self) -> str:
+        """Returns sheet sizes and icon coordinates as JSON string"""
+        return json.dumps({
+            "sheets": [{"width": sheet.width, "height": sheet.height} for sheet in self.sheets],
+            "icons": {
+                name: {"sheet": sheet, "x": x, "y": y, "w": width, "h": height}
+                for name, (sheet, x, y, width, height) in self.coordinates.items()
+            },
+        })
+
+    def asCss(self, sheet_urls: list = None, class_prefix: str = "icon-") -> str:
+        """Returns CSS sprite rules, one class per icon named class_prefix + icon name. "sheet_urls" lists the URL of each
+        sheet, default is "atlas_<sheet index>.png"."""
+        if sheet_urls is None:
+            sheet_urls = [f"atlas_{index}.png" for index in range(len(self.sheets))]
+        rules = []
+        for name, (sheet, x, y, width, height) in self.coordinates.items():
+            rules.append(
+                f".{class_prefix}{name} {{ background: url('{sheet_urls[sheet]}') {-x}px {-y}px no-repeat; "
+                f"width: {width}px; height: {height}px; }}"
+            )
+        return "\n".join(rules) + "\n"
+
+
+@dataclass(frozen=True)
+class IconStyle:
+    """Immutable look-and-feel settings for icons. Sizes are validated and colors are resolved to RGBA
+    tuples when the style is created. Styles are hashable, can be shared between threads and passed to
+    the IconFactory methods with the style parameter to render a variant without changing the factory.
+    Use replace() to create a modified copy.
+
+        icon_size (int, tuple): The size of the icons in pixels. Single int value or (int, int)
+        font_size (int): The size of the font. Default is icon_size
+        font_color (str, tuple): The color of the font. Name, RGBA-Tuple or hex string
+        outline_width (int): The width of the outline. 0 does not draw an outline
+        outline_color (str, tuple): The color of the outline.  Name or RGBA-Tuple or hex string
+        background_color (str, tuple): The background color. Name or RGBA-Tuple or hex string
+        background_radius (int): The radius of the background corners.
+        background_quality (str): "analytic" (default) computes exact anti-aliasing, "reference" uses 3x supersampling
+    """
+
+    icon_size: _SizeAttributeType = 64
+    font_size: int = None
+    font_color: _ColorAttributeType = "black"
+    outline_width: int = 0
+    outline_color: _ColorAttributeType = "black"
+    background_color: _ColorAttributeType = None
+    background_radius: int = 0
+    background_quality: str = "analytic"
+
+    def __post_init__(self):
+        icon_size = self.icon_size
+        if isinstance(icon_size, int):
+            icon_size = (icon_size, icon_size)
+        elif isinstance(icon_size, (tuple, list)) and len(icon_size)==2 and isinstance(icon_size[0], int) and isinstance(icon_size[1], int):
+            icon_size = tuple(icon_size)
+        else:
+            raise AttributeError('icon_size must be int or tuple (int,int)')
+        icon_size = (icon_size[0] if icon_size[0]>0 else 1, icon_size[1] if icon_size[1]>0 else 1)
+        smallest_side = min(icon_size)
+
+        font_size = self.font_size
+        if isinstance(font_size, int) and font_size <= smallest_side:
+            font_size = font_size if font_size >= 0 else 0
+        else:
+            font_size = smallest_side
+
+        if not self.background_quality in _BACKGROUND_QUALITIES:
+            raise ValueError(f'background_quality must be one of {", ".join(_BACKGROUND_QUALITIES)}')
+
+        # Frozen dataclass, the normalized values have to be set this way
+        object.__setattr__(self, "icon_size", icon_size)
+        object.__setattr__(self, "font_size", font_size)
+        object.__setattr__(self, "font_color", _rgba(self.font_color))
+        object.__setattr__(self, "outline_width", self.outline_width if self.outline_width>=0 else 0)
+        object.__setattr__(self, "outline_color", _rgba(self.outline_color))
+        object.__setattr__(self, "background_color", _rgba(self.background_color))
+        object.__setattr__(self, "background_radius", self.background_radius if self.background_radius>=0 else 0)
+
+    def replace(self, **changes) -> "IconStyle":
+        """Returns a copy of the style with the given attributes changed, e.g. style.replace(font_color='white')"""
+        return replace(self, **changes)
+
+    @property
+    def digest(self) -> str:
+        """A hash of the style that is stable across processes and Python versions"""
+        return hashlib.sha1(repr(astuple(self)).encode("utf-8")).hexdigest()
+
+
 class IconFactory:
     """Create an IconFactory for one of the icon sets included with iconipy. All icons created by this 
     IconFactory will share the same settings, allowing you to change the style for all icons upon 
@@ -223,9 +1463,35 @@ class IconFactory:
         outline_color (str, tuple): The color of the outline.  Name or RGBA-Tuple or hex string
         background_color (str, tuple): The background color. Name or RGBA-Tuple or hex string
         background_radius (int): The radius of the background corners.
+        background_quality (str): "analytic" (default) computes exact anti-aliasing, "reference" uses 3x supersampling
+        cache_size (int): Memory budget in bytes for rendered icons that are kept for reuse. 0 disables the cache
+        compressed_cache_size (int): Budget in bytes for icons evicted from the cache that are kept as PNG data
+        disk_cache_dir (str): Directory for encoded icons (asBytes, asBytesMany, aAsBytes, iterIcons with an image_format, save, asTempFile) that is reused by later runs and other processes. None disables it
+        disk_cache_size (int): Size limit of the disk cache in bytes, least recently used icons are removed first. 0 means no limit
+
+    An IconFactory can be shared between threads. All methods that create icons can be called concurrently,
+    rendering does not hold a global lock. updateCfg and changeIconSet are atomic: every icon is created
+    either with the settings before or after the change, never with a mix of both. Icons that are being
+    created while the settings change may still use the old settings. Pass a style to the methods instead
+    of calling updateCfg if threads need different looks at the same time.
     """
 
     _all_codepoints = {}
+    _codepoints_lock = threading.Lock()
+    _codepoint_index = None
+
+    # Shared per icon set, filled on first access
+    _versions = {}
+    _licenses = {}
+
+    # Temporary directory of a factory for asTempFile, created on first use
+    _temp_directory = None
+    _temp_directory_lock = threading.Lock()
+
+    # Factories handed out by IconFactory.get, keyed by their configuration
+    _registry = weakref.WeakValueDictionary()
+    _registry_lock = threading.Lock()
+    _shared = False
 
     def __init__(
         self,
@@ -237,48 +1503,134 @@ class IconFactory:
         outline_color: _ColorAttributeType = "black",
         background_color: _ColorAttributeType = None,
         background_radius: int = 0,
+        background_quality: str = "analytic",
+        cache_size: int = 0,
+        compressed_cache_size: int = 0,
+        disk_cache_dir: str = None,
+        disk_cache_size: int = 100_000_000,
     ) -> None:
         if not icon_set in _ICON_SETS.keys():
             raise ValueError(f'Unknown icon set "{icon_set}"')
 
-        self.icon_set_name = icon_set
-        '''Stores the name of the icon set'''
-        
-        self.icon_set_version = self._get_icon_set_version(
-            _ICON_SETS[icon_set]["VERSION_FILE"]
+        # Icon set name and font are replaced together by changeIconSet
+        # Codepoints, version, license and the temporary directory are read or created on first access
+        self._source = (icon_set, _ICON_SETS[icon_set]["FONT_FILE"])
+
+        # Serializes updateCfg and changeIconSet, never held while rendering
+        self._cfg_lock = threading.Lock()
+
+        self._style = IconStyle(
+            icon_size = icon_size,
+            font_size = font_size,
+            font_color = font_color,
+            outline_width = outline_width,
+            outline_color = outline_color,
+            background_color = background_color,
+            background_radius = background_radius,
+            background_quality = background_quality,
         )
+
+        self._render_cache = _RenderCache(cache_size, compressed_cache_size) if cache_size > 0 else None
+        self._disk_cache = _DiskCache(os.path.abspath(disk_cache_dir), disk_cache_size) if disk_cache_dir else None
+
+    @classmethod
+    def get(cls, *args, **kwargs):
+        '''Returns a shared IconFactory for the icon set and settings. Takes the same arguments as the constructor.
+        Everyone asking for the same configuration gets the same object, so font objects and cached icons
+        are shared as well. A shared factory is released as soon as nobody references it anymore.
+        Shared factories can't be changed, updateCfg and changeIconSet raise a RuntimeError. Pass a style
+        to the render methods or create your own IconFactory instead.'''
+        factory = cls(*args, **kwargs)
+        key = factory._configuration_key()
+        with IconFactory._registry_lock:
+            shared = IconFactory._registry.get(key)
+            if shared is None:
+                factory._shared = True
+                IconFactory._registry[key] = factory
+                shared = factory
+        return shared
+
+    def _configuration_key(self):
+        cache = self._render_cache
+        cache_cfg = (cache.max_bytes, cache.compressed_max_bytes) if cache else (0, 0)
+        disk_cache = self._disk_cache
+        cache_cfg += (disk_cache.directory, disk_cache.max_bytes) if disk_cache else (None, 0)
+        return (type(self), self.icon_set_name, self._font_path, self._style, cache_cfg)
+
+    def _check_not_shared(self, method):
+        if self._shared:
+            raise RuntimeError(f'{method} is not allowed on a shared IconFactory returned by get(), '
+                               'pass a style to the render methods or create your own IconFactory')
+
+    @property
+    def style(self) -> IconStyle:
+        '''The IconStyle used when no style is passed to a method. Use updateCfg to change it.'''
+        return self._style
+
+    @property
+    def icon_set_name(self) -> str:
+        '''Stores the name of the icon set'''
+        return self._source[0]
+
+    @property
+    def _font_path(self) -> str:
+        return self._source[1]
+
+    def _snapshot(self):
+        """Returns icon set name, font path and codepoints that belong together, even if
+        another thread calls changeIconSet at the same time"""
+        icon_set_name, font_path = self._source
+        return icon_set_name, font_path, self._get_codepoints(icon_set_name)
+
+    @property
+    def _drawing_kwargs(self) -> dict:
+        style = self._style
+        return {
+            "font_path": self._font_path,
+            "icon_size": style.icon_size,
+            "font_size": style.font_size,
+            "font_color": style.font_color,
+            "icon_outline_width": style.outline_width,
+            "icon_outline_color": style.outline_color,
+            "icon_background_color": style.background_color,
+            "icon_background_radius": style.background_radius,
+            "icon_background_quality": style.background_quality,
+        }
+
+    @property
+    def _codepoints(self):
+        return self._snapshot()[2]
+
+    @property
+    def icon_names(self) -> tuple:
+        '''A sorted tuple of all icon names for the selected icon set. When the documentation states that *"name" must be a valid key for the codepoints dictionary*, it means the name you enter must be included in this list.'''
+        return self._codepoints.names
+
+    @property
+    def icon_set_version(self) -> str:
         '''Stores the version string for the icon set'''
+        return self._get_version(self.icon_set_name)
 
+    @property
+    def license(self) -> str:
+        '''The icon set's license'''
         try:
-            self._codepoints = IconFactory._all_codepoints[icon_set]
+            return IconFactory._licenses[self.icon_set_name]
         except KeyError:
-            IconFactory._all_codepoints = self._read_codepoints()
-            self._codepoints = IconFactory._all_codepoints[icon_set]
-        
-        self.icon_names = list(self._codepoints.keys())
-        '''A list of all icon names for the selected icon set. When the documentation states that *"name" must be a valid key for the codepoints dictionary*, it means the name you enter must be included in this list.'''
-        
-        self.license = self._get_license_text(
-            _ICON_SETS[icon_set]["LICENSE_FILE"]
-        )
-        '''The icon set's license'''        
-        font_size = self._check_font_vs_icon_size(font_size, icon_size)
-        
-        self._drawing_kwargs = {
-            "font_path": _ICON_SETS[icon_set]["FONT_FILE"],
-            "icon_size": icon_size,
-            "font_size": font_size,
-            "font_color": font_color,
-            "icon_outline_width": outline_width,
-            "icon_outline_color": outline_color,
-            "icon_background_color": background_color,
-            "icon_background_radius": background_radius,
-        }
-
-        self._temp_dir = TemporaryDirectory()
+            license = self._get_license_text(_ICON_SETS[self.icon_set_name]["LICENSE_FILE"])
+            return IconFactory._licenses.setdefault(self.icon_set_name, license)
+
+    @property
+    def _temp_dir(self):
+        # Removed with its files when the factory is garbage collected
+        if self._temp_directory is None:
+            with IconFactory._temp_directory_lock:
+                if self._temp_directory is None:
+                    self._temp_directory = TemporaryDirectory()
+        return self._temp_directory
     
-    def changeIconSet(self, icon_set: str) -> list:
-        '''Change to a different icon set and retrieve a list containing the icon names
+    def changeIconSet(self, icon_set: str) -> tuple:
+        '''Change to a different icon set and retrieve a tuple containing the icon names
         of the new set. Available icon sets include: lucide, boxicons, lineicons, material_icons_regular, 
         material_icons_round_regular, material_icons_sharp_regular, and material_icons_outlined_regular.
         
@@ -286,16 +1638,10 @@ class IconFactory:
         '''
         if not icon_set in _ICON_SETS.keys():
             raise ValueError(f'Unknown icon set "{icon_set}"')
-        self.icon_set_name=icon_set        
-        self._drawing_kwargs['font_path']=_ICON_SETS[icon_set]["FONT_FILE"]
-        self._codepoints = IconFactory._all_codepoints[icon_set]
-        self.icon_names = list(self._codepoints.keys())
-        self.license = self._get_license_text(
-            _ICON_SETS[icon_set]["LICENSE_FILE"]
-        )
-        self.icon_set_version = self._get_icon_set_version(
-            _ICON_SETS[icon_set]["VERSION_FILE"]
-        )
+        self._check_not_shared("changeIconSet")
+        with self._cfg_lock:
+            self._source = (icon_set, _ICON_SETS[icon_set]["FONT_FILE"])
+            self.clearCache()
         return self.icon_names
     
     def updateCfg (self,
@@ -306,6 +1652,7 @@ class IconFactory:
                     outline_color: _ColorAttributeType = None,
                     background_color: _ColorAttributeType = None,
                     background_radius: int = None,
+                    background_quality: str = None,
                     ) -> dict:
         '''Modify one or more parameters of the IconFactory object and retrieve a dictionary containing 
         the updated configuration. Typically, distinct IconFactories are created for different icon 
@@ -318,86 +1665,208 @@ class IconFactory:
             outline_color (str, tuple): The color of the outline.  Name or RGBA-Tuple or hex string
             background_color (str, tuple): The background color. Name or RGBA-Tuple or hex string
             background_radius (int): The radius of the background corners.        
+            background_quality (str): "analytic" or "reference"
         '''            
-        if not icon_size == None:
-            if isinstance(icon_size, int):
-                icon_size = icon_size if icon_size>0 else 1
-            elif isinstance(icon_size, tuple): 
-                icon_size = (icon_size[0] if icon_size[0]>0 else 1, icon_size[1] if icon_size[1]>0 else 1)
-            self._drawing_kwargs['icon_size']=icon_size
-        if not font_size ==None:
-            self._drawing_kwargs['font_size']=self._check_font_vs_icon_size(font_size, icon_size)
-        if not font_color == None:
-            self._drawing_kwargs['font_color']=font_color
-        if not outline_width == None:
-            self._drawing_kwargs['icon_outline_width']=outline_width if outline_width>=0 else 0 
-        if not outline_color == None:
-            self._drawing_kwargs['icon_outline_color']=outline_color
-        if not background_color == None:
-            self._drawing_kwargs['icon_background_color']=background_color
-        if not background_radius == None:
-            self._drawing_kwargs['icon_background_radius']=background_radius if background_radius>=0 else 0                                                                     
-        
-        return self._drawing_kwargs
-        
-    def _check_font_vs_icon_size(self, font_size, icon_size):
-        if isinstance(icon_size, int):
-            smallest_side = icon_size
-        elif isinstance(icon_size, tuple) and len(icon_size)==2 and isinstance(icon_size[0], int) and isinstance(icon_size[1], int):
-            smallest_side = icon_size[0] if icon_size[0] <= icon_size[1] else icon_size[1]    
-        else:
-            raise AttributeError('icon_size must be int or tuple (int,int)')     
-         
-        if isinstance(font_size, int) and font_size <= smallest_side:
-            return font_size if font_size >= 0 else 0  
-        else:  
-            return smallest_side if smallest_side > 0 else 1
-                
-    def _read_codepoints(self):
-        codepoints = {}
-        for icon_set in _ICON_SETS.keys():
-            icon_set_codepoints = {}
-            _METADATA_FILE = _ICON_SETS[icon_set]["METADATA_FILE"]
-
-            if icon_set == "lucide":
-                with open(_METADATA_FILE) as json_data:
-                    codepoint_data = json.load(json_data)
-                for key in codepoint_data.keys():
-                    icon_set_codepoints[key] = codepoint_data[key]["encodedCode"][1:]
-
-            elif icon_set == "boxicons":
-                pattern = re.compile(
-                    r'.*\.(?P<codepoint_key>([a-z0-9]*-){1,4}[a-z0-9]*):.*\n.*"\\(?P<codepoint_value>.*)";'
-                )
-
-                with open(_METADATA_FILE, "r") as boxicons_codepoint_file:
-                    raw_content = boxicons_codepoint_file.read()
-
-                    # Find all matches in the file content
-                    matches = pattern.finditer(raw_content)
+        changes = {
+            "icon_size": icon_size,
+            "font_size": font_size,
+            "font_color": font_color,
+            "outline_width": outline_width,
+            "outline_color": outline_color,
+            "background_color": background_color,
+            "background_radius": background_radius,
+            "background_quality": background_quality,
+        }
+        changes = {key: value for key, value in changes.items() if not value == None}
+        self._check_not_shared("updateCfg")
+        with self._cfg_lock:
+            self._style = self._style.replace(**changes)
+            self.clearCache()
+            return self._drawing_kwargs
+
+    def clearCache(self):
+        '''Remove all rendered icons from the IconFactory's cache. This happens automatically when you call updateCfg or changeIconSet.'''
+        if self._render_cache:
+            self._render_cache.clear()
+
+    def cacheInfo(self) -> dict:
+        '''Retrieve a dictionary with the statistics of the rendered icon cache or None if the cache is disabled. Enable the cache by passing cache_size (and optionally compressed_cache_size) when creating the IconFactory.'''
+        if self._render_cache:
+            return self._render_cache.info()
+        return None
+
+    def diskCacheInfo(self) -> dict:
+        '''Retrieve a dictionary with the directory and statistics of the disk cache or None if it is disabled. Enable it by passing disk_cache_dir when creating the IconFactory.'''
+        if self._disk_cache:
+            return self._disk_cache.info()
+        return None
+
+    def _cache_key(self, font_path, codepoint, style):
+        return (font_path, codepoint, style)
+
+    def _disk_cache_key(self, icon_set_name, font_path, codepoint, style, image_format, options):
+        # Everything comes from the same snapshot, changeIconSet in another thread can't mix two icon sets
+        key = (
+            icon_set_name,
+            self._get_version(icon_set_name),
+            _font_digest(font_path),
+            codepoint,
+            style.digest,
+            image_format.upper(),
+            sorted(options.items()),
+        )
+        return hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+
+    def _encode(self, name, image_format, style, options, snapshot=None):
+        """Render and encode an icon, the disk cache is used if the IconFactory has one"""
+        style = self._style if style is None else style
+        icon_set_name, font_path, codepoints = self._snapshot() if snapshot is None else snapshot
+        if self._disk_cache is None or not name in codepoints:
+            return _encode_image(self._render(name, icon_set_name, font_path, codepoints, style), image_format, **options)
+        key = self._disk_cache_key(icon_set_name, font_path, codepoints[name], style, image_format, options)
+        data = self._disk_cache.get(key)
+        if data is None:
+            data = _encode_image(self._render(name, icon_set_name, font_path, codepoints, style), image_format, **options)
+            self._disk_cache.put(key, data)
+        return data
+
+    @classmethod
+    def _get_codepoints(cls, icon_set):
+        """Returns the codepoints of icon_set, the metadata file is parsed the first time the set is used"""
+        try:
+            return IconFactory._all_codepoints[icon_set]
+        except KeyError:
+            pass
+        with IconFactory._codepoints_lock:
+            # Another thread may have parsed the set while we were waiting
+            if not icon_set in IconFactory._all_codepoints:
+                IconFactory._all_codepoints[icon_set] = cls._read_codepoints(icon_set)
+            return IconFactory._all_codepoints[icon_set]
+
+    @classmethod
+    def _read_codepoints(cls, icon_set):
+        index, payload = cls._read_codepoint_index()
+        indexed_set = index.get(icon_set)
+        # The prebuilt index is only used if it was built from the installed metadata files
+        if indexed_set and indexed_set["version"] == IconFactory._get_version(icon_set):
+            names_start, names_end = indexed_set["names"]
+            codepoints_start, codepoints_end = indexed_set["codepoints"]
+            names = str(payload[names_start:names_end], "utf-8").split("\n")
+            codepoints = array.array("I")
+            codepoints.frombytes(payload[codepoints_start:codepoints_end])
+            if sys.byteorder == "big":
+                codepoints.byteswap()
+            return _CodepointTable(names, codepoints)
+        return _CodepointTable.from_dict(cls._parse_metadata_file(icon_set))
+
+    @staticmethod
+    def _read_codepoint_index():
+        """The index file starts with a JSON header line holding the version of each set and the
+        offsets of its sorted names (UTF-8, newline separated) and codepoints (little endian uint32)"""
+        if IconFactory._codepoint_index is None:
+            try:
+                if array.array("I").itemsize != 4:
+                    raise ValueError("Unsupported platform")
+                with open(_CODEPOINT_INDEX_FILE, "rb") as index_file:
+                    data = index_file.read()
+                header_end = data.index(b"\n")
+                header = json.loads(data[:header_end])
+                if header.get("format") != _CODEPOINT_INDEX_FORMAT:
+                    raise ValueError("Unsupported codepoint index format")
+                IconFactory._codepoint_index = (header["sets"], memoryview(data)[header_end + 1:])
+            except (OSError, ValueError, KeyError):
+                # Missing or broken index, fall back to the metadata files
+                IconFactory._codepoint_index = ({}, b"")
+        return IconFactory._codepoint_index
+
+    @staticmethod
+    def _parse_metadata_file(icon_set):
+        icon_set_codepoints = {}
+        _METADATA_FILE = _ICON_SETS[icon_set]["METADATA_FILE"]
+
+        if icon_set == "lucide":
+            with open(_METADATA_FILE) as json_data:
+                codepoint_data = json.load(json_data)
+            for key in codepoint_data.keys():
+                icon_set_codepoints[key] = int(codepoint_data[key]["encodedCode"][1:], 16)
+
+        elif icon_set == "boxicons":
+            pattern = re.compile(
+                r'.*\.(?P<codepoint_key>([a-z0-9]*-){1,4}[a-z0-9]*):.*\n.*"\\(?P<codepoint_value>.*)";'
+            )
 
-                    # Populate the dictionary with the matches
-                    for match in matches:
-                        codepoint_key = match.group("codepoint_key")
-                        codepoint_value = match.group("codepoint_value")
-                        icon_set_codepoints[codepoint_key] = codepoint_value
+            with open(_METADATA_FILE, "r") as boxicons_codepoint_file:
+                raw_content = boxicons_codepoint_file.read()
 
-            elif icon_set == "lineicons":
-                with open(_METADATA_FILE) as json_data:
-                    codepoint_data = json.load(json_data)
-                for key, value in codepoint_data.items():
-                    icon_set_codepoints[key] = hex(value)[2:]
+                # Find all matches in the file content
+                matches = pattern.finditer(raw_content)
 
-            else:
-                # Material icons
-                with open(_METADATA_FILE) as material_icons_codepoint_file:
-                    for line in material_icons_codepoint_file:
-                        codepoint_key, codepoint_value = line.strip().split()
-                        icon_set_codepoints[codepoint_key] = codepoint_value
+                # Populate the dictionary with the matches
+                for match in matches:
+                    codepoint_key = match.group("codepoint_key")
+                    codepoint_value = match.group("codepoint_value")
+                    icon_set_codepoints[codepoint_key] = int(codepoint_value, 16)
 
-            codepoints[icon_set] = icon_set_codepoints
+        elif icon_set == "lineicons":
+            with open(_METADATA_FILE) as json_data:
+                codepoint_data = json.load(json_data)
+            for key, value in codepoint_data.items():
+                icon_set_codepoints[key] = value
 
-        return codepoints
+        else:
+            # Material icons
+            with open(_METADATA_FILE) as material_icons_codepoint_file:
+                for line in material_icons_codepoint_file:
+                    codepoint_key, codepoint_value = line.strip().split()
+                    icon_set_codepoints[codepoint_key] = int(codepoint_value, 16)
+
+        return icon_set_codepoints
+
+    @staticmethod
+    def _read_tags(icon_set):
+        """Returns {name: tags} with the tags and categories of the icon set's metadata, only lucide's info.json has room for them"""
+        if icon_set != "lucide":
+            return {}
+        with open(_ICON_SETS[icon_set]["METADATA_FILE"]) as json_data:
+            metadata = json.load(json_data)
+        tags = {}
+        for name, entry in metadata.items():
+            terms = list(entry.get("tags", ())) + list(entry.get("categories", ()))
+            if terms:
+                tags[name] = terms
+        return tags
+
+    @staticmethod
+    def _build_codepoint_index(index_file=_CODEPOINT_INDEX_FILE):
+        """Parse the metadata files of all icon sets and write the prebuilt index loaded at runtime"""
+        sets = {}
+        payload = bytearray()
+        for icon_set in _ICON_SETS.keys():
+            codepoints = _CodepointTable.from_dict(IconFactory._parse_metadata_file(icon_set))
+            names = "\n".join(codepoints.names).encode("utf-8")
+            values = array.array("I", codepoints.values())
+            if sys.byteorder == "big":
+                values.byteswap()
+            names_start = len(payload)
+            payload += names
+            codepoints_start = len(payload)
+            payload += values.tobytes()
+            sets[icon_set] = {
+                "version": IconFactory._get_icon_set_version(None, _ICON_SETS[icon_set]["VERSION_FILE"]),
+                "names": [names_start, codepoints_start],
+                "codepoints": [codepoints_start, len(payload)],
+            }
+        header = json.dumps({"format": _CODEPOINT_INDEX_FORMAT, "sets": sets}, separators=(",", ":"))
+        with open(index_file, "wb") as file_handle:
+            file_handle.write(header.encode("utf-8") + b"\n" + payload)
+
+    @staticmethod
+    def _get_version(icon_set):
+        try:
+            return IconFactory._versions[icon_set]
+        except KeyError:
+            version = IconFactory._get_icon_set_version(None, _ICON_SETS[icon_set]["VERSION_FILE"])
+            return IconFactory._versions.setdefault(icon_set, version)
 
     def _get_license_text(self, license_file):
         with open(license_file, "r") as file_handle:
@@ -407,164 +1876,441 @@ class IconFactory:
         with open(version_file, "r") as file_handle:
             return file_handle.readline().rstrip()
 
-    def _draw_character(
-        self,
-        character,
-        font_path,
-        font_size=32,
-        font_color="grey",
-        icon_size=32,
-        icon_background_color=None,
-        icon_outline_width=0,
-        icon_background_radius=0,
-        icon_outline_color="dimgrey",
-    ):
-
-        # Create image
-        if isinstance (icon_size, int):
-            width = height = icon_size
-        elif isinstance (icon_size, tuple) and isinstance (icon_size[0], int) and isinstance (icon_size[1], int):
-            width = icon_size[0]
-            height = icon_size[1]
-        else:
-            raise AttributeError ('icon_size must be of type int or tuple (int, int)')
-        
-        # Add a background
-        if icon_background_color or icon_outline_width:
-            image = self._image_round_background(
-                size = (width, height),
-                fill = icon_background_color,
-                outline = icon_outline_color,
-                outline_width = icon_outline_width,
-                outline_radius = icon_background_radius,
-            )
+    def search(self, search_name: str, all_sets: bool = False, fuzzy: bool = False, tags: bool = False, limit: int = None) -> list:
+        """Search for an icon name. Returns a list of icon names containing the search_name, best matches first: the exact name, names
+        starting with search_name, names with a word starting with search_name, then all other names containing it. Shorter names come first
+        within each group. The search index of an icon set is built on the first search.
+
+            all_sets (bool): Search all icon sets included with iconipy (and the custom set of a CustomIconFactory), returns a list of (icon set name, icon name) tuples
+            fuzzy (bool): Also find names with a word that is one typo away from search_name, ranked after the other matches
+            tags (bool): Also find icons by meaning, e.g. "trash" finds "delete". Uses the words of the names, a list of synonyms,
+                         categories encoded in the names (bx- regular, bxs- solid, bxl- logo) and tags of the icon set's metadata.
+                         Ranked after the names containing search_name
+            limit (int): Maximum number of results
+        """
+        query = search_name.lower()
+        hits = []
+        for set_order, (icon_set_name, codepoints) in enumerate(self._search_tables(all_sets)):
+            names = codepoints.names
+            index = codepoints.search_index()
+            positions, bounds = index.ranked(query, fuzzy)
+            groups = [positions[bounds[rank]:bounds[rank + 1]] for rank in range(6)]
+            if tags:
+                # Tag matches rank after the names containing the query and before typos
+                tag_index = codepoints.tag_index(lambda: self._read_tags(icon_set_name))
+                tagged = {position for position in tag_index.search(query) if query not in index.lower[position]}
+                groups[4] = sorted(tagged, key=index.sort_key)
+                groups[5] = [position for position in groups[5] if position not in tagged]
+            # Each set is already in result order, only the first "limit" names of a set can be in the result
+            matches = ((rank, position) for rank, group in enumerate(groups) for position in group)
+            for rank, position in itertools.islice(matches, limit):
+                name = names[position]
+                hits.append((rank, len(name), name, set_order, icon_set_name))
+        if limit is None:
+            hits.sort()
         else:
-            image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-
-        if font_size > 0:
-            # Load font
-            font = ImageFont.truetype(font_path, font_size)
-
-            # Draw character
-            draw = ImageDraw.Draw(image)
-
-            x = width // 2
-            y = height // 2
-
-            draw.text((x, y), character, font=font, anchor="mm", fill=font_color)
-        return image
-
-    def _image_round_background(
-        self,
-        size = (64,64),
-        fill = "silver",
-        outline = "grey",
-        outline_width = 7,
-        outline_radius = 10,
-        factor = 3,
-    ):
-        """Create and return a background image with rounded corners. Set the outline radius to size/2 to achieve a circular background."""
-        width = size[0] 
-        height = size[1]
-        im = Image.new("RGBA", (factor * width, factor * height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(im, "RGBA")
-        draw.rounded_rectangle(
-            (0, 0, (factor * width)-1, (factor * height)-1),
-            radius=factor * outline_radius,
-            outline=outline,
-            fill=fill,
-            width=factor * outline_width,
-        )
-        im = im.resize((width, height), Image.LANCZOS)
-        return im
-
-    def search(self, search_name: str) -> list:
-        """Search for an icon name. Returns a list of icon names containing the search_name"""
-        return [icon_name for icon_name in self.icon_names if search_name.lower() in icon_name.lower()]
+            hits = heapq.nsmallest(limit, hits)
+        if all_sets:
+            return [(icon_set_name, name) for _, _, name, _, icon_set_name in hits]
+        return [name for _, _, name, _, _ in hits]
+
+    def _search_tables(self, all_sets):
+        """Returns (icon set name, codepoints) of the icon sets to search"""
+        icon_set_name, _, codepoints = self._snapshot()
+        if not all_sets:
+            return [(icon_set_name, codepoints)]
+        tables = [(name, self._get_codepoints(name)) for name in _ICON_SETS]
+        if not icon_set_name in _ICON_SETS:
+            tables.insert(0, (icon_set_name, codepoints))
+        return tables
+
+    def asPil(self, name: str, style: IconStyle = None):
+        """Create image as PIL Image Object, "name" must be a valid key for the codepoints dictionary. Pass an IconStyle as "style" to render a variant without changing the IconFactory's settings, e.g. style=factory.style.replace(font_color='white')"""
+        style = self._style if style is None else style
+        icon_set_name, font_path, codepoints = self._snapshot()
+        return self._render(name, icon_set_name, font_path, codepoints, style)
+
+    def asPilStates(self, name: str, states: dict = None, style: IconStyle = None, disabled: str = None) -> dict:
+        """Create one icon in several states, e.g. for buttons with mouseover and pressed images. Returns a dictionary {state: PIL Image Object}
+        that always contains "normal", rendered with "style" (default is the IconFactory's style). The glyph is rasterized once
+        and reused for all states that share the icon and font size, only the colors are applied per state.
+
+            states (dict): Maps state names to an IconStyle or to a dictionary of changes to the normal style, e.g. {"hover": {"font_color": "white"}}
+            disabled (str): Add a "disabled" state derived from the normal image without rendering it again. "desaturate" turns it grey, "fade" makes it translucent
+        """
+        if disabled is not None and disabled not in _DISABLED_MODES:
+            raise ValueError(f'Unknown disabled mode "{disabled}", use one of {", ".join(_DISABLED_MODES)}')
+        style = self._style if style is None else style
+        icon_set_name, font_path, codepoints = self._snapshot()
+        state_styles = {"normal": style}
+        for state, state_style in (states or {}).items():
+            state_styles[state] = state_style if isinstance(state_style, IconStyle) else style.replace(**state_style)
+        images = {
+            state: self._render(name, icon_set_name, font_path, codepoints, state_style)
+            for state, state_style in state_styles.items()
+        }
+        if disabled is not None:
+            images["disabled"] = _disabled_image(images["normal"], disabled)
+        return images
 
-    def asPil(self, name: str):
-        """Create image as PIL Image Object, "name" must be a valid key for the codepoints dictionary"""
-        if not name in self._codepoints:
+    def _render(self, name, icon_set_name, font_path, codepoints, style):
+        if not name in codepoints:
             raise ValueError(
-                f'Icon with name "{name}" not available. Icon Set: {self.icon_set_name}, Version: {self.icon_set_version}'
+                f'Icon with name "{name}" not available. Icon Set: {icon_set_name}, Version: {self.icon_set_version}'
             )
 
-        character = chr(int(self._codepoints[name], 16))
-        return self._draw_character(character, **self._drawing_kwargs)
-
-    def asTkPhotoImage(self, name: str):
+        codepoint = codepoints[name]
+        if self._render_cache:
+            key = self._cache_key(font_path, codepoint, style)
+            image = self._render_cache.get(key)
+            if image is None:
+                image = _draw_character(chr(codepoint), font_path, style)
+                self._render_cache.put(key, image.copy())
+            return image
+        return _draw_character(chr(codepoint), font_path, style)
+
+    def _render_many(self, names, style, workers, image_format=None):
+        style = self._style if style is None else style
+        snapshot = self._snapshot()
+        icon_set_name, font_path, codepoints = snapshot
+        names = list(dict.fromkeys(names))
+
+        def render(name):
+            try:
+                if image_format:
+                    return self._encode(name, image_format, style, {}, snapshot)
+                return self._render(name, icon_set_name, font_path, codepoints, style)
+            except Exception as error:
+                return error
+
+        if workers and workers > 1:
+            # Pillow releases the GIL while encoding, so threads help with asBytesMany
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(render, names))
+        else:
+            results = [render(name) for name in names]
+        return dict(zip(names, results))
+
+    def asPilMany(self, names, style: IconStyle = None, workers: int = None) -> dict:
+        """Create PIL Image Objects for several icons at once. Returns a dictionary {name: image} in the order of "names".
+        Icons that cannot be created don't abort the batch, their name maps to the exception instead (e.g. ValueError for unknown names).
+        Use "workers" to render with a pool of threads."""
+        return self._render_many(names, style, workers)
+
+    def asBytesMany(self, names, image_format: str="PNG", style: IconStyle = None, workers: int = None) -> dict:
+        """Returns image data as bytestrings for several icons at once in a dictionary {name: bytes} in the order of "names".
+        Icons that cannot be created don't abort the batch, their name maps to the exception instead (e.g. ValueError for unknown names).
+        Use "workers" to render and encode with a pool of threads."""
+        return self._render_many(names, style, workers, image_format)
+
+    def asAtlas(self, names = None, style: IconStyle = None, max_size: int = 2048, padding: int = 1) -> IconAtlas:
+        """Pack icons into power-of-two sprite sheets of at most max_size x max_size pixels and return an IconAtlas with the
+        sheets and a map of the icon coordinates (also available as JSON and CSS). "names" defaults to the whole icon set,
+        "padding" adds transparent pixels between the icons, a max_size that is not a power of two is rounded down.
+        Raises the first error if an icon cannot be created."""
+        images = self.asPilMany(self.icon_names if names is None else names, style)
+        for image in images.values():
+            if isinstance(image, Exception):
+                raise image
+        items = [(name, image.width, image.height) for name, image in images.items()]
+        sheets = []
+        coordinates = {}
+        for sheet_index, (width, height, placed) in enumerate(_pack_sheets(items, max_size, padding)):
+            sheet = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+            for name, (x, y) in placed.items():
+                image = images[name]
+                sheet.paste(image, (x, y))
+                coordinates[name] = (sheet_index, x, y, image.width, image.height)
+            sheets.append(sheet)
+        # Same order as the names that were passed in
+        coordinates = {name: coordinates[name] for name in images}
+        return IconAtlas(sheets, coordinates)
+
+    def iterIcons(self, names = None, image_format: str = None, style: IconStyle = None, read_ahead: int = 0):
+        """Iterate over icons without saving them to disk or keeping them in memory. Yields (name, icon) tuples, the icon is a
+        PIL Image Object or, if "image_format" is set (e.g. "PNG"), a bytestring. "names" defaults to the whole icon set.
+        With read_ahead > 0 up to read_ahead icons are created in advance on a background thread while you process the current one.
+        Raises ValueError when an unknown name is reached."""
+        style = self._style if style is None else style
+        snapshot = self._snapshot()
+        icon_set_name, font_path, codepoints = snapshot
+        names = codepoints.names if names is None else names
+
+        def create(name):
+            if image_format:
+                return self._encode(name, image_format, style, {}, snapshot)
+            return self._render(name, icon_set_name, font_path, codepoints, style)
+
+        if not read_ahead or read_ahead < 1:
+            for name in names:
+                yield name, create(name)
+            return
+
+        # Bounded queue of (name, icon, error) triples, None marks the end
+        buffer = queue.Queue(maxsize=read_ahead)
+        stop = threading.Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def produce():
+            try:
+                for name in names:
+                    if not put((name, create(name), None)):
+                        return
+            except Exception as error:
+                put((None, None, error))
+            put(None)
+
+        threading.Thread(target=produce, daemon=True).start()
+        try:
+            while True:
+                item = buffer.get()
+                if item is None:
+                    return
+                name, icon, error = item
+                if error is not None:
+                    raise error
+                yield name, icon
+        finally:
+            # Lets the background thread finish if the caller stops iterating early
+            stop.set()
+
+    async def aAsPil(self, name: str, style: IconStyle = None, timeout: float = None):
+        """Awaitable asPil for asyncio applications, the icon is created on a small thread pool so the event loop keeps running.
+        Concurrent requests for the same icon and style share one render, every caller gets its own copy of the image.
+        Raises asyncio.TimeoutError after "timeout" seconds, the render itself is not interrupted."""
+        image = await self._run_coalesced(name, None, style, timeout)
+        return image.copy()
+
+    async def aAsBytes(self, name: str, image_format: str="PNG", style: IconStyle = None, timeout: float = None):
+        """Awaitable asBytes for asyncio applications, the icon is created and encoded on a small thread pool so the event loop keeps running.
+        Concurrent requests for the same icon, style and image_format share one render.
+        Raises asyncio.TimeoutError after "timeout" seconds, the render itself is not interrupted."""
+        return await self._run_coalesced(name, image_format, style, timeout)
+
+    async def _run_coalesced(self, name, image_format, style, timeout):
+        style = self._style if style is None else style
+        snapshot = self._snapshot()
+        icon_set_name, font_path, codepoints = snapshot
+        key = (font_path, name, codepoints.get(name), style, image_format)
+
+        def create():
+            if image_format:
+                return self._encode(name, image_format, style, {}, snapshot)
+            return self._render(name, icon_set_name, font_path, codepoints, style)
+
+        import asyncio # Only needed by the async methods, importing it takes longer than importing iconipy
+        future = _submit_coalesced(key, create)
+        # shield() keeps a timeout of one caller from cancelling the render the other callers wait for
+        return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+
+    def asTkPhotoImage(self, name: str, style: IconStyle = None):
         """Create image as tkinter PhotoImage Object. Make sure you initialize tkinter first. Place your function call after creating the root instance (root = Tk() or equivalent for other GUI frameworks), "name" must be a valid key for the codepoints dictionary"""
-        return ImageTk.PhotoImage(self.asPil(name))
+        from PIL import ImageTk # Imports tkinter, only needed by the tkinter bridges
+        return ImageTk.PhotoImage(self.asPil(name, style))
 
-    def asTkBitmapImage(self, name: str):
+    def asTkBitmapImage(self, name: str, style: IconStyle = None):
         """Create image as *monochrome* (two-color) tkinter BitmapImage Object. Make sure you initialize tkinter first. Place your function call after creating the root instance (root = Tk() or equivalent for other GUI frameworks),  "name" must be a valid key for the codepoints dictionary"""
-        mode_one_img = self.asPil(name).convert("1")
+        mode_one_img = self.asPil(name, style).convert("1")
         inverted_img = ImageOps.invert(mode_one_img)
+        from PIL import ImageTk
         return ImageTk.BitmapImage(inverted_img)
            
-    def asBytes(self, name: str, image_format: str="PNG"):
+    def asBytes(self, name: str, image_format: str="PNG", style: IconStyle = None):
         """Returns image data as bytestring, "name" must be a valid key for the codepoints dictionary, the image_format parameter should be set to one of the formats supported by Pillow. These formats include common image types like JPEG, PNG, ICO, and GIF"""
-        with io.BytesIO() as output:
-            self.asPil(name).save(output, format=image_format)
-            return output.getvalue()
+        return self._encode(name, image_format, style, {})
 
-    def asBytesIo(self, name: str, image_format: str="PNG"):
+    def asBytesIo(self, name: str, image_format: str="PNG", style: IconStyle = None):
         """Returns image data as BytesIO object, "name" must be a valid key for the codepoints dictionary, the image_format parameter should be set to one of the formats supported by Pillow. These formats include common image types like JPEG, PNG, ICO, and GIF"""
-        output = io.BytesIO()
-        self.asPil(name).save(output, format=image_format)
-        output.seek(0)
-        return output
+        return io.BytesIO(self._encode(name, image_format, style, {}))
 
-    def asRawList(self, name: str, type: str="RGB"):
+    def asRawList(self, name: str, type: str="RGB", style: IconStyle = None):
         """Returns the pixel data of the image as a list. "name" must be a valid key for the codepoints dictionary, type="RGB" contains values 0-255, type="FLOAT" contains values 0-1"""
+        data = self.asPil(name, style).tobytes()
+        if type == "FLOAT":
+            return list(map(_FLOAT_VALUES.__getitem__, data))
+        return list(data)  # 'RGB' or any other type
+
+    def asRawBuffer(self, name: str, type: str="RGB", style: IconStyle = None):
+        """Returns the RGBA pixel data of the image without building a Python list, e.g. for texture APIs that accept buffers.
+        type="RGB" returns a read-only memoryview of bytes with values 0-255, type="FLOAT" returns an array('f') with values 0-1"""
+        icon = self.asPil(name, style)
+        if type == "FLOAT":
+            # Scale each band as a float image and interleave the bands into RGBA order
+            bands = icon.split()
+            pixel_data = array.array("f", bytes(4 * len(bands) * icon.width * icon.height))
+            for offset, band in enumerate(bands):
+                values = array.array("f")
+                values.frombytes(band.convert("F").point(lambda value: value / 255.0).tobytes())
+                pixel_data[offset::len(bands)] = values
+            return pixel_data
+        return memoryview(icon.tobytes())
+
+    def asPixelBuffer(self, name: str, pixel_format: str="RGBA", style: IconStyle = None) -> bytes:
+        """Returns the raw pixel data as bytestring in the given pixel format, "name" must be a valid key for the codepoints dictionary.
+        Toolkits can wrap the bytes without converting them, e.g. QImage(data, width, height, QImage.Format.Format_ARGB32_Premultiplied)
+        with pixel_format="ARGB32_Premultiplied", cairo's FORMAT_ARGB32 with "ARGB32_Premultiplied", wx.Bitmap.FromBufferRGBA with "RGBA"
+        or Kivy's blit_buffer with "RGBA" / "BGRA".
+
+            pixel_format (str): "RGBA", "BGRA" or "ARGB" byte order with straight alpha, the same with "_Premultiplied" appended
+                                for premultiplied alpha, or "ARGB32" / "ARGB32_Premultiplied" for native-endian 32 bit pixels 0xAARRGGBB
+        """
+        return _pixel_bytes(self.asPil(name, style), pixel_format)
+
+    def asNumpy(self, name: str, dtype: str="uint8", layout: str="HWC", style: IconStyle = None):
+        """Returns the RGBA pixel data as NumPy array, requires NumPy to be installed. "name" must be a valid key for the codepoints dictionary.
+        dtype="uint8" contains values 0-255 in a read-only array that shares the image buffer, dtype="float32" contains values 0-1.
+        layout="HWC" has the shape (height, width, 4), layout="CHW" has the shape (4, height, width), with dtype="uint8" it is a view of the HWC array"""
+        numpy = _import_numpy()
+        if layout not in ("HWC", "CHW"):
+            raise ValueError(f'Unsupported layout "{layout}", use "HWC" or "CHW"')
+        pixel_data = _numpy_pixels(numpy, self.asPil(name, style))
+        if layout == "CHW":
+            pixel_data = pixel_data.transpose(2, 0, 1)
+        if numpy.dtype(dtype) == numpy.uint8:
+            return pixel_data
+        if numpy.dtype(dtype) == numpy.float32:
+            # Written to a new C-contiguous array, also for the CHW layout
+            return numpy.divide(pixel_data, 255, out=numpy.empty(pixel_data.shape, numpy.float32))
+        raise ValueError(f'Unsupported dtype "{dtype}", use "uint8" or "float32"')
+
+    def asNumpyMany(self, names, dtype: str="uint8", style: IconStyle = None, out = None):
+        """Returns the RGBA pixel data of several icons as one NumPy array of the shape (len(names), height, width, 4), requires NumPy to be installed.
+        dtype="uint8" contains values 0-255, dtype="float32" contains values 0-1. Pass a preallocated array as "out" to fill it instead of allocating a new one.
+        Raises the first error if an icon cannot be created."""
+        numpy = _import_numpy()
+        style = self._style if style is None else style
+        icon_set_name, font_path, codepoints = self._snapshot()
+        names = list(names)
+        width, height = style.icon_size
+        shape = (len(names), height, width, 4)
+        if out is None:
+            out = numpy.empty(shape, dtype)
+        elif out.shape != shape:
+            raise ValueError(f"out has the shape {out.shape}, expected {shape}")
+        if out.dtype not in (numpy.uint8, numpy.float32):
+            raise ValueError(f'Unsupported dtype "{out.dtype}", use "uint8" or "float32"')
+        for index, name in enumerate(names):
+            pixel_data = _numpy_pixels(numpy, self._render(name, icon_set_name, font_path, codepoints, style))
+            if out.dtype == numpy.uint8:
+                out[index] = pixel_data
+            else:
+                numpy.divide(pixel_data, 255, out=out[index])
+        return out
 
-        def _calc_pixel_value(value, type):
-            if type == "FLOAT":
-                return value / 255.0
-            return value  # 'RGB' or any other type
-
-        icon = self.asPil(name)
-        pixel_data = []
-        # Process image to list
-        # numpy etc. are WAY faster but introduce new dependencies
-        for i in range(0, icon.height):
-            for j in range(0, icon.width):
-                pixel = icon.getpixel((j, i))
-                pixel_data.append(_calc_pixel_value(pixel[0], type))
-                pixel_data.append(_calc_pixel_value(pixel[1], type))
-                pixel_data.append(_calc_pixel_value(pixel[2], type))
-                pixel_data.append(_calc_pixel_value(pixel[3], type))
-        return pixel_data
-
-    def asQImage(self, name: str):
+    def asQImage(self, name: str, style: IconStyle = None):
         """Create image as QImage Object, "name" must be a valid key for the codepoints dictionary"""
-        return ImageQt.ImageQt(self.asPil(name))
+        from PIL import ImageQt # Probes for PyQt6 / PySide6, only needed by the Qt bridges
+        return ImageQt.ImageQt(self.asPil(name, style))
 
-    def asQPixmap(self, name: str):
+    def asQPixmap(self, name: str, style: IconStyle = None):
         """Create image as QPixmap Object, "name" must be a valid key for the codepoints dictionary"""
-        return ImageQt.toqpixmap(self.asPil(name))
+        from PIL import ImageQt
+        return ImageQt.toqpixmap(self.asPil(name, style))
     
-    def asTempFile(self, name: str, extension: str="png"):
-        '''Returns a path to a temporary image file.  If your framework only accepts file paths, you can use this function. The image format is determined by the file extension (Default is "png") and should be set to one of the formats supported by Pillow. Only formats that support transparency (ico, png, gif, webp, jp2, ...) are supported. "name" must be a valid key for the codepoints dictionary.'''
+    def asTempFile(self, name: str, extension: str="png", style: IconStyle = None):
+        '''Returns a path to a temporary image file.  If your framework only accepts file paths, you can use this function. The image format is determined by the file extension (Default is "png") and should be set to one of the formats supported by Pillow. Only formats that support transparency (ico, png, gif, webp, jp2, ...) are supported. "name" must be a valid key for the codepoints dictionary.
+        The file is deleted together with the IconFactory's temporary directory when the IconFactory is garbage collected (or the interpreter exits),
+        keep a reference to the IconFactory as long as you use the file.'''
         filepath = os.path.join(self._temp_dir.name, f'{str(uuid.uuid4())}.{extension.lower()}')
-        self.save(name, filepath)   
+        self.save(name, filepath, style)   
         return filepath
     
-    def save(self, name: str, save_as: str):
+    def save(self, name: str, save_as: str, style: IconStyle = None):
         """Saves the icon to file "save_as", the image format is determined by the file extension and should be set to one of the formats supported by Pillow. Only formats that support transparency (ico, png, gif, webp, jp2, ...) are supported. "name" must be a valid key for the codepoints dictionary"""
-        kwargs={}
-        if save_as.lower().endswith('.ico'):
-            kwargs['sizes'] = [self._drawing_kwargs['icon_size']]
-        self.asPil(name).save(save_as, **kwargs)
-
-    def saveAll(self, save_to_dir: str, extension: str="png"):
-        '''Saves all icons in the icon set to path "save_to_dir", the image format is determined by the "extension" and should be set to one of the formats supported by Pillow. Only formats that support transparency (ico, png, gif, webp, jp2, ...) are supported.'''
-        for name in self._codepoints.keys():
-            self.save(name, os.path.join(save_to_dir, f"{name}.{extension.lower()}"))
-
-    def show(self, name: str):
+        style = self._style if style is None else style
+        self._save(name, save_as, style, self._snapshot())
+
+    def _save(self, name, save_as, style, snapshot):
+        """Save an icon of the icon set in snapshot (see _snapshot) using the render and disk caches"""
+        icon_set_name, font_path, codepoints = snapshot
+        image_format = Image.registered_extensions().get(os.path.splitext(save_as)[1].lower())
+        if self._disk_cache is None or image_format is None:
+            _save_image(self._render(name, icon_set_name, font_path, codepoints, style), save_as, style)
+            return
+        data = self._encode(name, image_format, style, _save_options(save_as, style), snapshot)
+        with open(save_as, "wb") as file_handle:
+            file_handle.write(data)
+
+    def saveAll(
+        self,
+        save_to_dir: str,
+        extension: str="png",
+        style: IconStyle = None,
+        workers: int = None,
+        progress = None,
+        cancel = None,
+    ) -> dict:
+        '''Saves all icons in the icon set to path "save_to_dir", the image format is determined by the "extension" and should be set to one of the formats supported by Pillow. Only formats that support transparency (ico, png, gif, webp, jp2, ...) are supported.
+        
+            workers (int): Number of processes rendering and encoding the icons. None or 1 saves the icons one after another in the calling process, uses the IconFactory's render and disk caches and raises the first error. The files are identical in both cases
+            progress (callable): Called as progress(done, total) with the number of icons processed so far
+            cancel (threading.Event): Stops saving as soon as possible when set. Anything with an is_set() method can be used
+        
+        Returns a dictionary with the number of icons "saved", a dictionary of "failed" icon names and error messages (only with workers), and "cancelled" (bool).
+        Raises FileNotFoundError if save_to_dir is not an existing directory.
+        '''
+        if not os.path.isdir(save_to_dir):
+            raise FileNotFoundError(f'Directory "{save_to_dir}" does not exist')
+        style = self._style if style is None else style
+        extension = extension.lower()
+        snapshot = self._snapshot()
+        _, font_path, codepoints = snapshot
+        icons = list(codepoints.items())
+        total = len(icons)
+        failed = {}
+        done = 0
+        cancelled = False
+
+        if not workers or workers <= 1:
+            for name, _ in icons:
+                if cancel is not None and cancel.is_set():
+                    cancelled = True
+                    break
+                self._save(name, os.path.join(save_to_dir, f"{name}.{extension}"), style, snapshot)
+                done += 1
+                if progress:
+                    progress(done, total)
+            return {"saved": done - len(failed), "failed": failed, "cancelled": cancelled}
+
+        # Workers receive font path, style and codepoints and send back error messages only
+        chunk_size = max(1, min(64, total // (workers * 4) or 1))
+        chunks = [icons[i:i + chunk_size] for i in range(0, total, chunk_size)]
+        from concurrent.futures import ProcessPoolExecutor # Imports multiprocessing, only needed with workers
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_save_icons, font_path, style, chunk, save_to_dir, extension): chunk
+                for chunk in chunks
+            }
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                try:
+                    for failed_name, message in future.result():
+                        failed[failed_name] = message
+                except Exception as error:
+                    # The worker itself failed (e.g. killed), report the icons of the chunk
+                    for name, _ in futures[future]:
+                        failed[name] = f"{type(error).__name__}: {error}"
+                done += len(futures[future])
+                if progress:
+                    progress(done, total)
+                if not cancelled and cancel is not None and cancel.is_set():
+                    cancelled = True
+                    for pending in futures:
+                        pending.cancel()
+        return {"saved": done - len(failed), "failed": failed, "cancelled": cancelled}
+
+    def show(self, name: str, style: IconStyle = None):
         """Show the icon in an external viewer using the PIL Image.show() method. "name" must be a valid key for the codepoints dictionary"""
-        self.asPil(name).show()
+        self.asPil(name, style).show()
 
 
 class CustomIconFactory(IconFactory):
@@ -582,9 +2328,14 @@ class CustomIconFactory(IconFactory):
         outline_color (str, tuple): The color of the outline.  Name, RGBA-Tuple or hex string
         background_color (str, tuple): The background color. Name, RGBA-Tuple or hex string
         background_radius (int): The radius of the background corners.
+        background_quality (str): "analytic" (default) computes exact anti-aliasing, "reference" uses 3x supersampling
         font_path (str): The path to the custom icon set font file.
         codepoints (dict): A dictionary of icon names and codepoints.
         version (str): The version of the icon set.
+        cache_size (int): Memory budget in bytes for rendered icons that are kept for reuse. 0 disables the cache
+        compressed_cache_size (int): Budget in bytes for icons evicted from the cache that are kept as PNG data
+        disk_cache_dir (str): Directory for encoded icons (asBytes, asBytesMany, aAsBytes, iterIcons with an image_format, save, asTempFile) that is reused by later runs and other processes. None disables it
+        disk_cache_size (int): Size limit of the disk cache in bytes, least recently used icons are removed first. 0 means no limit
     """
 
     def __init__(
@@ -597,41 +2348,61 @@ class CustomIconFactory(IconFactory):
         outline_color: _ColorAttributeType = "black",
         background_color: _ColorAttributeType = None,
         background_radius: int = 0,
+        background_quality: str = "analytic",
         font_path: str = None,
         codepoints: dict = None,
         version: str = "0.1",
+        cache_size: int = 0,
+        compressed_cache_size: int = 0,
+        disk_cache_dir: str = None,
+        disk_cache_size: int = 100_000_000,
     ) -> None:
         if not font_path or not codepoints:
             raise ValueError(
                 f'You need to supply a font path and codepoint dictionary"'
             )
 
-        self.icon_set_name = icon_set
-        '''Stores the name of the icon set'''
-
-        self.icon_set_version = version
-        '''Stores the version string for the icon set'''
+        self._version = version
         
-        self._codepoints = codepoints
+        self._custom_codepoints = _CodepointTable.from_dict(
+            {name: int(codepoint, 16) for name, codepoint in codepoints.items()}
+        )
+        
+        self._source = (icon_set, font_path)
+
+        self._cfg_lock = threading.Lock()
+
+        self._style = IconStyle(
+            icon_size = icon_size,
+            font_size = font_size,
+            font_color = font_color,
+            outline_width = outline_width,
+            outline_color = outline_color,
+            background_color = background_color,
+            background_radius = background_radius,
+            background_quality = background_quality,
+        )
 
-        self.icon_names = list(self._codepoints.keys())
-        '''A list of all icon names for the selected icon set. When the documentation states that *"name" must be a valid key for the codepoints dictionary*, it means the name you enter must be included in this list.'''
+        self._render_cache = _RenderCache(cache_size, compressed_cache_size) if cache_size > 0 else None
+        self._disk_cache = _DiskCache(os.path.abspath(disk_cache_dir), disk_cache_size) if disk_cache_dir else None
 
-        self.license = 'Unknown License'
-        '''For custom icon sets the default value is "Unknown License"'''        
-        
-        font_size = self._check_font_vs_icon_size(font_size, icon_size)
+    def _snapshot(self):
+        icon_set_name, font_path = self._source
+        return icon_set_name, font_path, self._custom_codepoints
 
-        self._drawing_kwargs = {
-            "font_path": font_path,
-            "font_size": font_size,
-            "font_color": font_color,
-            "icon_size": icon_size,
-            "icon_background_color": background_color,
-            "icon_outline_width": outline_width,
-            "icon_background_radius": background_radius,
-            "icon_outline_color": outline_color,
-        }
+    def _configuration_key(self):
+        codepoints = self._custom_codepoints
+        return super()._configuration_key() + (self._version, codepoints.names, codepoints._codepoints.tobytes())
+
+    def _get_version(self, icon_set):
+        if icon_set == self._source[0]:
+            return self._version
+        return IconFactory._get_version(icon_set)
+
+    @property
+    def license(self) -> str:
+        '''For custom icon sets the default value is "Unknown License"'''
+        return 'Unknown License'
 
     def changeIconSet(self, icon_set: str):
         '''Not implemented for CustomIconFactory'''
@@ -639,6 +2410,10 @@ class CustomIconFactory(IconFactory):
  
 
 if __name__ == "__main__":
+    if "--build-index" in sys.argv:
+        # Run after updating the assets of an icon set
+        IconFactory._build_codepoint_index()
+        print(f"Codepoint index written to {_CODEPOINT_INDEX_FILE}")
     print(f"iconipy {_SCRIPT_VERSION}")
     print("--------------------------------------")
     for set in _ICON_SETS.keys():
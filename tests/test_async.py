@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import iconipy.iconipy
+from iconipy import IconFactory
+
+
+CALLERS = 8
+
+
+@pytest.fixture
+def slow_renders(monkeypatch):
+    """Count the renders and make them slow enough for requests to overlap"""
+    draw_character = iconipy.iconipy._draw_character
+    renders = []
+    lock = threading.Lock()
+
+    def slow_draw_character(*args):
+        with lock:
+            renders.append(args[0])
+        time.sleep(0.2)
+        return draw_character(*args)
+
+    monkeypatch.setattr(iconipy.iconipy, "_draw_character", slow_draw_character)
+    return renders
+
+
+def test_concurrent_requests_share_one_render(slow_renders):
+    factory = IconFactory(icon_set="lucide", icon_size=32)
+    expected = IconFactory(icon_set="lucide", icon_size=32).asBytes("house")
+    slow_renders.clear()
+
+    async def main():
+        return await asyncio.gather(*(factory.aAsBytes("house") for _ in range(CALLERS)))
+
+    results = asyncio.run(main())
+    assert results == [expected] * CALLERS
+    assert len(slow_renders) == 1
+
+
+def test_images_are_copies(slow_renders):
+    factory = IconFactory(icon_set="lucide", icon_size=32)
+
+    async def main():
+        return await asyncio.gather(factory.aAsPil("house"), factory.aAsPil("house"))
+
+    first, second = asyncio.run(main())
+    assert len(slow_renders) == 1
+    assert first is not second
+    first.putpixel((0, 0), (1, 2, 3, 4))
+    assert second.getpixel((0, 0)) != (1, 2, 3, 4)
+
+
+def test_timeout_does_not_cancel_other_callers(slow_renders):
+    factory = IconFactory(icon_set="lucide", icon_size=32, font_color="red")
+    expected = IconFactory(icon_set="lucide", icon_size=32, font_color="red").asBytes("house")
+    slow_renders.clear()
+
+    async def main():
+        return await asyncio.gather(
+            factory.aAsBytes("house", timeout=0.01),
+            *(factory.aAsBytes("house", timeout=10) for _ in range(CALLERS - 1)),
+            return_exceptions=True,
+        )
+
+    timed_out, *results = asyncio.run(main())
+    assert isinstance(timed_out, asyncio.TimeoutError)
+    assert results == [expected] * (CALLERS - 1)
+    assert len(slow_renders) == 1
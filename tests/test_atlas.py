@@ -0,0 +1,25 @@
+import pytest
+
+from iconipy import IconFactory
+
+
+def _is_power_of_two(value):
+    return value & (value - 1) == 0
+
+
+@pytest.mark.parametrize("max_size, sheet_size", [(1000, 512), (1024, 1024), (1500, 1024), (300, 256)])
+def test_sheets_are_powers_of_two(max_size, sheet_size):
+    factory = IconFactory(icon_set="lucide", icon_size=48)
+    atlas = factory.asAtlas(factory.icon_names[:300], max_size=max_size)
+    for sheet in atlas.sheets:
+        assert _is_power_of_two(sheet.width) and _is_power_of_two(sheet.height)
+        assert sheet.width <= sheet_size and sheet.height <= sheet_size
+    assert len(atlas.coordinates) == 300
+
+
+def test_icons_larger_than_a_sheet():
+    factory = IconFactory(icon_set="lucide", icon_size=48)
+    with pytest.raises(ValueError):
+        factory.asAtlas(["house"], max_size=60)
+    with pytest.raises(ValueError):
+        factory.asAtlas(["house"], max_size=0)
@@ -0,0 +1,51 @@
+import pytest
+
+from iconipy.iconipy import _image_round_background
+
+
+# size, fill, outline, outline_width, radius
+PLATES = [
+    ((64, 64), "white", "black", 6, 10),
+    ((64, 64), "silver", "grey", 7, 10),
+    ((64, 64), "white", "black", 1, 10),
+    ((33, 33), "navy", "yellow", 2, 16),
+    ((96, 48), (255, 0, 0, 128), "blue", 4, 24),
+    ((64, 64), "white", (0, 0, 0, 128), 6, 32),
+    ((200, 120), "#00ff0080", "#ff00ff80", 12, 60),
+    ((128, 128), None, "red", 10, 20),
+    ((64, 64), "silver", None, 0, 12),
+]
+
+
+def _pixels(image):
+    return [image.getpixel((x, y)) for y in range(image.height) for x in range(image.width)]
+
+
+@pytest.mark.parametrize("size, fill, outline, outline_width, radius", PLATES)
+def test_analytic_background_matches_reference(size, fill, outline, outline_width, radius):
+    analytic = _pixels(_image_round_background(size, fill, outline, outline_width, radius))
+    reference = _pixels(_image_round_background(size, fill, outline, outline_width, radius, quality="reference"))
+
+    # Pixels that are mostly covered in both images have the same color, no grey fringe at the outline's edge
+    color_error = max(
+        (max(abs(a[i] - r[i]) for i in range(3)) for a, r in zip(analytic, reference) if a[3] > 64 and r[3] > 64),
+        default=0,
+    )
+    assert color_error <= 40
+
+    # The coverage only differs by the blur of the supersampled reference
+    alpha_error = sum(abs(a[3] - r[3]) for a, r in zip(analytic, reference)) / len(analytic)
+    assert alpha_error <= 2
+
+    premultiplied_error = sum(
+        abs(a[i] * a[3] - r[i] * r[3]) / 255 for a, r in zip(analytic, reference) for i in range(3)
+    ) / (3 * len(analytic))
+    assert premultiplied_error <= 3
+
+
+def test_outline_edge_is_not_covered_twice():
+    # Black outline on white fill: partially covered edge pixels must stay black, only their alpha is reduced
+    plate = _image_round_background((64, 64), "white", "black", 6, 10)
+    for pixel in _pixels(plate):
+        if 0 < pixel[3] < 255 and pixel[3] > 16:
+            assert pixel[:3] == (0, 0, 0)
@@ -0,0 +1,93 @@
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from iconipy import IconFactory
+
+
+THREADS = 16
+RENDERS_PER_THREAD = 60
+
+STYLE_A = dict(icon_size=48, font_color="black", background_color="silver",
+               outline_width=2, outline_color="dimgrey", background_radius=8)
+STYLE_B = dict(icon_size=48, font_color="white", background_color="navy",
+               outline_width=0, background_radius=20)
+
+NAMES = IconFactory(icon_set="lucide").icon_names[:40]
+
+
+def _reference(style):
+    factory = IconFactory(icon_set="lucide", **style)
+    return {name: factory.asPil(name).tobytes() for name in NAMES}
+
+
+@pytest.fixture(scope="module")
+def reference_a():
+    return _reference(STYLE_A)
+
+
+@pytest.fixture(scope="module")
+def reference_b():
+    return _reference(STYLE_B)
+
+
+def _hammer(factory, check):
+    """Render random icons from many threads at once and return the names that failed check"""
+    start = threading.Barrier(THREADS)
+
+    def work(seed):
+        rng = random.Random(seed)
+        start.wait()
+        failed = []
+        for name in rng.choices(NAMES, k=RENDERS_PER_THREAD):
+            if not check(name, factory.asPil(name).tobytes()):
+                failed.append(name)
+        return failed
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        return [name for failed in executor.map(work, range(THREADS)) for name in failed]
+
+
+@pytest.mark.parametrize("cache_size", [0, 200_000])
+def test_one_factory_many_threads(reference_a, cache_size):
+    factory = IconFactory(icon_set="lucide", cache_size=cache_size, **STYLE_A)
+    assert _hammer(factory, lambda name, pixels: pixels == reference_a[name]) == []
+
+
+@pytest.mark.parametrize("cache_size", [0, 200_000])
+def test_update_cfg_while_rendering(reference_a, reference_b, cache_size):
+    factory = IconFactory(icon_set="lucide", cache_size=cache_size, **STYLE_A)
+    stop = threading.Event()
+    toggles = 0
+
+    def toggle():
+        nonlocal toggles
+        while not stop.is_set():
+            factory.updateCfg(**(STYLE_B if toggles % 2 == 0 else STYLE_A))
+            toggles += 1
+
+    toggler = threading.Thread(target=toggle)
+    toggler.start()
+    try:
+        # Every icon must be rendered completely in one of the two styles, never a mix of both
+        failed = _hammer(factory, lambda name, pixels: pixels in (reference_a[name], reference_b[name]))
+    finally:
+        stop.set()
+        toggler.join()
+    assert toggles > 0
+    assert failed == []
+
+
+def test_codepoints_are_loaded_once(monkeypatch):
+    monkeypatch.setattr(IconFactory, "_all_codepoints", {})
+    start = threading.Barrier(THREADS)
+
+    def create(_):
+        start.wait()
+        return IconFactory(icon_set="boxicons").icon_names
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        icon_names = list(executor.map(create, range(THREADS)))
+    assert all(names is icon_names[0] for names in icon_names)
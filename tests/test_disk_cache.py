@@ -0,0 +1,42 @@
+from iconipy import IconFactory, CustomIconFactory
+from iconipy.iconipy import _ICON_SETS
+
+
+def test_key_comes_from_the_snapshot(tmp_path):
+    factory = IconFactory(icon_set="boxicons", disk_cache_dir=str(tmp_path))
+    icon_set_name, font_path, codepoints = factory._snapshot()
+    name = codepoints.names[0]
+    factory.changeIconSet("lucide")
+    key = factory._disk_cache_key(icon_set_name, font_path, codepoints[name], factory.style, "PNG", {})
+
+    reference = IconFactory(icon_set="boxicons", disk_cache_dir=str(tmp_path))
+    assert key == reference._disk_cache_key(icon_set_name, font_path, codepoints[name], reference.style, "PNG", {})
+
+
+def test_custom_version_invalidates_entries(tmp_path):
+    def custom(version):
+        return CustomIconFactory(icon_set="custom", font_path=_ICON_SETS["lucide"]["FONT_FILE"],
+                                 codepoints={"house": "e0f5"}, version=version, disk_cache_dir=str(tmp_path))
+
+    data = custom("1.0").asBytes("house")
+    same_version = custom("1.0")
+    assert same_version.asBytes("house") == data
+    assert same_version.diskCacheInfo()["hits"] == 1
+    new_version = custom("1.1")
+    new_version.asBytes("house")
+    assert new_version.diskCacheInfo()["hits"] == 0
+    assert new_version.icon_set_version == "1.1"
+
+
+def test_batch_stream_and_async_paths_use_the_disk_cache(tmp_path):
+    import asyncio
+
+    names = ["house", "save", "settings"]
+    data = IconFactory(icon_set="lucide", disk_cache_dir=str(tmp_path)).asBytesMany(names)
+
+    factory = IconFactory(icon_set="lucide", disk_cache_dir=str(tmp_path))
+    assert factory.asBytesMany(names, workers=2) == data
+    assert dict(factory.iterIcons(names, image_format="PNG")) == data
+    assert dict(factory.iterIcons(names, image_format="PNG", read_ahead=2)) == data
+    assert asyncio.run(factory.aAsBytes("house")) == data["house"]
+    assert factory.diskCacheInfo()["hits"] == 3 + 3 + 3 + 1
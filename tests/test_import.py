@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# Heavy modules that must only be imported by the methods that need them
+DEFERRED_MODULES = ["tkinter", "PIL.ImageTk", "PIL.ImageQt", "asyncio", "multiprocessing", "concurrent.futures.process"]
+
+
+def _run(code):
+    env = dict(os.environ, PYTHONPATH=SRC_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # -X importtime writes "import time: self | cumulative | module" lines to stderr
+    imported = {line.rsplit("|", 1)[1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+    return result.stdout, imported
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import iconipy",
+        "import iconipy; iconipy.IconFactory()",
+        "import iconipy; factory = iconipy.IconFactory(); factory.asPil('house'); factory.asBytes('house'); factory.search('house')",
+    ],
+)
+def test_heavy_modules_are_deferred(code):
+    stdout, imported = _run(code + "; import sys; print(' '.join(sorted(sys.modules)))")
+    loaded = set(stdout.split()) | imported
+    assert "iconipy" in loaded
+    assert [module for module in DEFERRED_MODULES if module in loaded] == []
@@ -0,0 +1,31 @@
+import pytest
+
+from iconipy import IconFactory, maskCacheInfo, setMaskCacheSize, clearMaskCache
+from iconipy.iconipy import _MASK_CACHE_BYTES
+
+
+@pytest.fixture
+def small_mask_cache():
+    clearMaskCache()
+    setMaskCacheSize(500_000)
+    yield
+    setMaskCacheSize(_MASK_CACHE_BYTES)
+    clearMaskCache()
+
+
+def test_mask_caches_stay_within_byte_budget(small_mask_cache):
+    factory = IconFactory(icon_set="material_icons_regular", icon_size=256, font_size=200, background_color="white")
+    for icon_size in (256, 257, 258):
+        for name in factory.icon_names[:40]:
+            factory.asPil(name, style=factory.style.replace(icon_size=icon_size))
+    for name, info in maskCacheInfo().items():
+        assert 0 < info["bytes"] <= 500_000, name
+
+    clearMaskCache()
+    assert all(info["size"] == 0 and info["bytes"] == 0 for info in maskCacheInfo().values())
+
+
+def test_oversized_entry_is_not_cached(small_mask_cache):
+    factory = IconFactory(icon_set="lucide", icon_size=1024, background_color="white")
+    factory.asPil("house")
+    assert maskCacheInfo()["plates"]["size"] == 0
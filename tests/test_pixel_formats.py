@@ -0,0 +1,48 @@
+import sys
+
+import pytest
+from PIL import Image
+
+from iconipy import IconFactory
+from iconipy.iconipy import _PIXEL_FORMATS, _pixel_bytes
+
+
+PIXELS = [(200, 100, 50, 128), (10, 20, 30, 255), (255, 255, 255, 1), (90, 80, 70, 0)]
+
+
+def _premultiply(red, green, blue, alpha):
+    return tuple(round(value * alpha / 255) for value in (red, green, blue)) + (alpha,)
+
+
+def _reference(pixel_format):
+    """Pack PIXELS in pure Python"""
+    data = b""
+    for pixel in PIXELS:
+        red, green, blue, alpha = _premultiply(*pixel) if pixel_format.endswith("_Premultiplied") else pixel
+        order = pixel_format.replace("_Premultiplied", "")
+        if order == "ARGB32":
+            data += (alpha << 24 | red << 16 | green << 8 | blue).to_bytes(4, sys.byteorder)
+        else:
+            channels = {"R": red, "G": green, "B": blue, "A": alpha}
+            data += bytes(channels[channel] for channel in order)
+    return data
+
+
+@pytest.mark.parametrize("pixel_format", list(_PIXEL_FORMATS))
+def test_pixel_format(pixel_format):
+    image = Image.new("RGBA", (len(PIXELS), 1))
+    image.putdata(PIXELS)
+    assert _pixel_bytes(image, pixel_format) == _reference(pixel_format)
+
+
+def test_native_argb32():
+    image = Image.new("RGBA", (1, 1), (1, 2, 3, 4))
+    assert int.from_bytes(_pixel_bytes(image, "ARGB32"), sys.byteorder) == 0x04010203
+
+
+def test_as_pixel_buffer():
+    factory = IconFactory(icon_set="lucide", icon_size=24, font_color=(200, 100, 50, 128), background_color=None)
+    assert factory.asPixelBuffer("house") == factory.asPil("house").tobytes()
+    assert len(factory.asPixelBuffer("house", "ARGB32_Premultiplied")) == 24 * 24 * 4
+    with pytest.raises(ValueError):
+        factory.asPixelBuffer("house", "XRGB")
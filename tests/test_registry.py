@@ -0,0 +1,29 @@
+import pytest
+
+from iconipy import IconFactory
+
+
+def test_get_returns_one_factory_per_configuration():
+    shared = IconFactory.get(icon_set="lucide", icon_size=40, font_color="black")
+    assert IconFactory.get(icon_set="lucide", icon_size=40, font_color="black") is shared
+    assert IconFactory.get(icon_set="lucide", icon_size=40, font_color="red") is not shared
+
+
+def test_shared_factory_can_not_be_changed():
+    shared = IconFactory.get(icon_set="lucide", icon_size=40, font_color="black")
+    with pytest.raises(RuntimeError):
+        shared.updateCfg(font_color="red")
+    with pytest.raises(RuntimeError):
+        shared.changeIconSet("boxicons")
+    assert shared.style.font_color == (0, 0, 0, 255)
+    assert shared.icon_set_name == "lucide"
+
+    small = shared.asPil("house", style=shared.style.replace(icon_size=32))
+    assert small.size == (32, 32)
+    assert shared.asPil("house").size == (40, 40)
+
+
+def test_own_factory_can_be_changed():
+    factory = IconFactory(icon_set="lucide", icon_size=40, font_color="black")
+    factory.updateCfg(font_color="red")
+    assert factory.changeIconSet("boxicons") == factory.icon_names
@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from iconipy import IconFactory
+
+
+def test_save_all_to_missing_directory(tmp_path):
+    factory = IconFactory(icon_set="lucide")
+    missing = str(tmp_path / "no" / "such" / "dir")
+    with pytest.raises(FileNotFoundError):
+        factory.saveAll(missing)
+    with pytest.raises(FileNotFoundError):
+        factory.saveAll(missing, workers=2)
+    assert not os.path.exists(missing)
+
+
+def test_save_all_serial_raises_the_first_error(tmp_path):
+    factory = IconFactory(icon_set="lucide", icon_size=16)
+    with pytest.raises(Exception):
+        factory.saveAll(str(tmp_path), extension="nosuchformat")
+
+
+def test_save_all(tmp_path):
+    factory = IconFactory(icon_set="lineicons", icon_size=16)
+    result = factory.saveAll(str(tmp_path))
+    assert result == {"saved": len(factory.icon_names), "failed": {}, "cancelled": False}
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{name}.png" for name in factory.icon_names)
@@ -0,0 +1,57 @@
+import pytest
+
+from iconipy import IconFactory
+
+
+@pytest.fixture(scope="module")
+def factory():
+    return IconFactory(icon_set="lucide")
+
+
+@pytest.mark.parametrize("query", ["a", "x", "ho", "arrow", "trash"])
+def test_limit_returns_the_best_matches(factory, query):
+    results = factory.search(query, all_sets=True, tags=True)
+    assert results
+    for limit in (1, 10, 100):
+        assert factory.search(query, all_sets=True, tags=True, limit=limit) == results[:limit]
+
+
+def test_single_character_ranking(factory):
+    results = factory.search("x")
+    names = factory.icon_names
+    assert set(results) == {name for name in names if "x" in name.lower()}
+    assert results[0] == "x"
+    prefix = [name for name in results if name.startswith("x")]
+    assert results[:len(prefix)] == sorted(prefix, key=lambda name: (len(name), name))
+    word_start = results.index("circle-x")
+    assert all(not name.startswith("x") for name in results[word_start:])
+    assert results.index("circle-x") < results.index("box")
+
+
+@pytest.mark.parametrize("icon_set, query, expected", [
+    ("lucide", "trash", "delete"),
+    ("lucide", "garbage", "trash-2"),
+    ("lucide", "home", "house"),
+    ("material_icons_regular", "trash", "delete"),
+    ("boxicons", "solid", "bxs-home"),
+])
+def test_tags_find_synonyms(icon_set, query, expected):
+    factory = IconFactory(icon_set=icon_set)
+    assert expected not in factory.search(query)
+    assert expected in factory.search(query, tags=True)
+
+
+@pytest.mark.parametrize("icon_set, query, unrelated", [
+    ("lucide", "power", "bell-off"),
+    ("lucide", "power", "mic-off"),
+    ("material_icons_regular", "power", "mic_off"),
+    ("lucide", "play", "align-start-vertical"),
+    ("lucide", "outline", "chart-line"),
+    ("lucide", "light", "sun"),
+    ("lucide", "import", "download"),
+    ("material_icons_regular", "trash", "remove_road"),
+])
+def test_tags_ignore_ambiguous_words(icon_set, query, unrelated):
+    factory = IconFactory(icon_set=icon_set)
+    assert unrelated in factory.icon_names
+    assert unrelated not in factory.search(query, tags=True)
@@ -0,0 +1,20 @@
+import gc
+import os
+
+from iconipy import IconFactory
+
+
+def test_factory_creates_no_directory_until_needed():
+    factory = IconFactory(icon_set="lucide")
+    assert factory._temp_directory is None
+
+
+def test_temp_files_are_removed_with_the_factory():
+    factory = IconFactory(icon_set="lucide", icon_size=16)
+    paths = [factory.asTempFile("house"), factory.asTempFile("save", "webp")]
+    directory = os.path.dirname(paths[0])
+    assert all(os.path.isfile(path) and os.path.dirname(path) == directory for path in paths)
+
+    del factory
+    gc.collect()
+    assert not os.path.exists(directory)